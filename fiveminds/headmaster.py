@@ -19,6 +19,31 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Directories skipped by analyze_repository (hidden ones are skipped too)
+IGNORED_DIRS = frozenset({'node_modules', '__pycache__', 'venv', 'env'})
+
+# File extension -> language reported in the repository context
+LANGUAGE_BY_EXTENSION = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.jsx': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.tsx': 'TypeScript',
+    '.java': 'Java',
+    '.go': 'Go',
+    '.rs': 'Rust',
+}
+
+# Marker file name -> framework reported in the repository context
+FRAMEWORK_BY_FILENAME = {
+    'package.json': 'Node.js',
+    'requirements.txt': 'Python',
+    'setup.py': 'Python',
+    'pyproject.toml': 'Python',
+    'Cargo.toml': 'Rust/Cargo',
+    'go.mod': 'Go/Modules',
+}
+
 
 class HeadMaster:
     """
@@ -56,43 +81,25 @@ class HeadMaster:
         # Walk through the repository
         for root, dirs, filenames in os.walk(self.repo_path):
             # Skip hidden directories and common ignore patterns
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
+            dirs[:] = [d for d in dirs if d[:1] != '.' and d not in IGNORED_DIRS]
             
             rel_root = os.path.relpath(root, self.repo_path)
-            if rel_root == '.':
-                rel_root = ''
+            prefix = '' if rel_root == '.' else rel_root + os.sep
             
             for filename in filenames:
-                if filename.startswith('.'):
+                if filename[:1] == '.':
                     continue
                     
-                file_path = os.path.join(rel_root, filename) if rel_root else filename
-                files.append(file_path)
+                files.append(prefix + filename)
                 
                 # Detect languages and frameworks
-                ext = os.path.splitext(filename)[1]
-                if ext in ['.py']:
-                    languages.add('Python')
-                elif ext in ['.js', '.jsx']:
-                    languages.add('JavaScript')
-                elif ext in ['.ts', '.tsx']:
-                    languages.add('TypeScript')
-                elif ext in ['.java']:
-                    languages.add('Java')
-                elif ext in ['.go']:
-                    languages.add('Go')
-                elif ext in ['.rs']:
-                    languages.add('Rust')
+                language = LANGUAGE_BY_EXTENSION.get(os.path.splitext(filename)[1])
+                if language:
+                    languages.add(language)
                 
-                # Detect frameworks
-                if filename in ['package.json']:
-                    frameworks.add('Node.js')
-                elif filename in ['requirements.txt', 'setup.py', 'pyproject.toml']:
-                    frameworks.add('Python')
-                elif filename in ['Cargo.toml']:
-                    frameworks.add('Rust/Cargo')
-                elif filename in ['go.mod']:
-                    frameworks.add('Go/Modules')
+                framework = FRAMEWORK_BY_FILENAME.get(filename)
+                if framework:
+                    frameworks.add(framework)
 
         self.repo_context = RepositoryContext(
             path=str(self.repo_path),
@@ -224,7 +224,7 @@ index 1234567..abcdefg 100644
         
         # Initialize shell tools if not already done
         if self.sandbox_path and not self.shell_tools:
-            self.shell_tools = ShellTools(str(self.sandbox_path), timeout=300)
+            self.shell_tools = ShellTools(str(self.sandbox_path), timeout=300, capture_logs=False)
         
         if self.shell_tools:
             # Try to run actual tests
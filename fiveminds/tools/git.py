@@ -14,17 +14,36 @@ All commands are:
 - Timeout-bound
 """
 
+import os
 import subprocess
 import logging
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+
+from .logring import LogRing
 
 logger = logging.getLogger(__name__)
 
 # Configuration
 DEFAULT_TIMEOUT = 30  # seconds
+# Cap on concurrent git processes for GitTools.bulk (avoids fork storms)
+MAX_PARALLEL = max(1, int(os.environ.get("GITTOOLS_MAX_PARALLEL", min(8, os.cpu_count() or 1))))
+
+# Shared by all GitTools instances; worker threads are only spawned on first use
+_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_PARALLEL, thread_name_prefix="gittools")
 
+# Environment for git subprocesses, built once: the C locale skips message
+# catalog loading (and keeps output parseable), optional index locks are
+# disabled so concurrent read-only commands don't contend, and credential
+# prompts fail fast instead of hanging a sandboxed agent.
+_GIT_ENV: Dict[str, str] = {
+    **os.environ,
+    "LC_ALL": "C",
+    "GIT_OPTIONAL_LOCKS": "0",
+    "GIT_TERMINAL_PROMPT": "0",
+}
 
 @dataclass
 class ToolResult:
@@ -32,7 +51,7 @@ class ToolResult:
     success: bool
     output: Any
     error: Optional[str] = None
-    logs: List[str] = field(default_factory=list)
+    logs: Sequence[str] = ()
 
 
 class GitTools:
@@ -55,17 +74,45 @@ class GitTools:
         """
         self.repo_path = Path(repo_path).resolve()
         self.timeout = timeout
-        self._logs: List[str] = []
+        self._logs = LogRing()
         logger.info(f"GitTools initialized for: {self.repo_path}")
         
         # Verify it's a git repository
-        if not (self.repo_path / '.git').exists():
+        if self._resolve_gitdir() is None:
             logger.warning(f"Not a git repository: {self.repo_path}")
     
-    def _log(self, message: str) -> None:
-        """Add a log entry."""
+    def _resolve_gitdir(self) -> Optional[Path]:
+        """
+        Locate the git directory for the repository.
+        
+        Handles worktrees and submodules, where `.git` is a file containing
+        a `gitdir: <path>` line instead of a directory.
+        
+        Returns:
+            Path to the git directory, or None if this is not a repository
+        """
+        dot_git = self.repo_path / '.git'
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                first_line = dot_git.read_text(encoding='utf-8').split('\n', 1)[0]
+            except OSError:
+                return None
+            if first_line.startswith('gitdir:'):
+                gitdir = Path(first_line[len('gitdir:'):].strip())
+                if not gitdir.is_absolute():
+                    gitdir = self.repo_path / gitdir
+                return gitdir.resolve()
+        return None
+    
+    def _log(self, message: str, *args: Any) -> None:
+        """Add a log entry, %-formatting `message` with `args`."""
+        if args:
+            message = message % args
         self._logs.append(message)
-        logger.debug(message)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(message)
     
     def _run_git(self, args: List[str], timeout: Optional[int] = None) -> ToolResult:
         """
@@ -82,12 +129,14 @@ class GitTools:
         cmd = ['git'] + args
         cmd_str = ' '.join(cmd)
         
-        self._log(f"Executing: {cmd_str}")
+        mark = self._logs.mark()
+        self._log("Executing: %s", cmd_str)
         
         try:
             result = subprocess.run(
                 cmd,
                 cwd=str(self.repo_path),
+                env=_GIT_ENV,
                 capture_output=True,
                 text=True,
                 timeout=cmd_timeout
@@ -97,14 +146,14 @@ class GitTools:
                 return ToolResult(
                     success=True,
                     output=result.stdout.strip(),
-                    logs=self._logs.copy()
+                    logs=self._logs.since(mark)
                 )
             else:
                 return ToolResult(
                     success=False,
                     output=result.stdout.strip() if result.stdout else None,
                     error=result.stderr.strip(),
-                    logs=self._logs.copy()
+                    logs=self._logs.since(mark)
                 )
                 
         except subprocess.TimeoutExpired:
@@ -112,7 +161,7 @@ class GitTools:
                 success=False,
                 output=None,
                 error=f"Git command timed out after {cmd_timeout} seconds",
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
             
         except FileNotFoundError:
@@ -120,7 +169,7 @@ class GitTools:
                 success=False,
                 output=None,
                 error="Git is not installed or not in PATH",
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
             
         except Exception as e:
@@ -128,7 +177,7 @@ class GitTools:
                 success=False,
                 output=None,
                 error=str(e),
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
     
     def status(self, short: bool = False, 
@@ -143,9 +192,10 @@ class GitTools:
         Returns:
             ToolResult with status information
         """
-        self._log(f"git.status called: short={short}, untracked={untracked}")
+        mark = self._logs.mark()
+        self._log("git.status called: short=%s, untracked=%s", short, untracked)
         
-        args = ['status']
+        args = ['status', '--no-ahead-behind']
         
         if short:
             args.append('-s')
@@ -163,9 +213,10 @@ class GitTools:
             return ToolResult(
                 success=True,
                 output=status_info,
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
         
+        result.logs = self._logs.since(mark)
         return result
     
     def checkout(self, target: str, create: bool = False,
@@ -181,7 +232,8 @@ class GitTools:
         Returns:
             ToolResult with checkout result
         """
-        self._log(f"git.checkout called: target={target}, create={create}")
+        mark = self._logs.mark()
+        self._log("git.checkout called: target=%s, create=%s", target, create)
         
         args = ['checkout']
         
@@ -197,10 +249,11 @@ class GitTools:
         result = self._run_git(args)
         
         if result.success:
-            self._log(f"git.checkout completed: {target}")
+            self._log("git.checkout completed: %s", target)
         else:
-            self._log(f"git.checkout failed: {result.error}")
+            self._log("git.checkout failed: %s", result.error)
         
+        result.logs = self._logs.since(mark)
         return result
     
     def create_branch(self, branch_name: str, 
@@ -215,7 +268,8 @@ class GitTools:
         Returns:
             ToolResult with branch creation result
         """
-        self._log(f"git.create_branch called: branch_name={branch_name}")
+        mark = self._logs.mark()
+        self._log("git.create_branch called: branch_name=%s", branch_name)
         
         args = ['branch', branch_name]
         
@@ -225,10 +279,11 @@ class GitTools:
         result = self._run_git(args)
         
         if result.success:
-            self._log(f"git.create_branch completed: {branch_name}")
+            self._log("git.create_branch completed: %s", branch_name)
         else:
-            self._log(f"git.create_branch failed: {result.error}")
+            self._log("git.create_branch failed: %s", result.error)
         
+        result.logs = self._logs.since(mark)
         return result
     
     def merge(self, branch: str, no_ff: bool = False,
@@ -244,7 +299,8 @@ class GitTools:
         Returns:
             ToolResult with merge result
         """
-        self._log(f"git.merge called: branch={branch}, no_ff={no_ff}")
+        mark = self._logs.mark()
+        self._log("git.merge called: branch=%s, no_ff=%s", branch, no_ff)
         
         args = ['merge']
         
@@ -259,10 +315,11 @@ class GitTools:
         result = self._run_git(args)
         
         if result.success:
-            self._log(f"git.merge completed: {branch}")
+            self._log("git.merge completed: %s", branch)
         else:
-            self._log(f"git.merge failed: {result.error}")
+            self._log("git.merge failed: %s", result.error)
         
+        result.logs = self._logs.since(mark)
         return result
     
     def diff(self, target: Optional[str] = None,
@@ -281,7 +338,8 @@ class GitTools:
         Returns:
             ToolResult with diff output
         """
-        self._log(f"git.diff called: target={target}, staged={staged}")
+        mark = self._logs.mark()
+        self._log("git.diff called: target=%s, staged=%s", target, staged)
         
         args = ['diff', f'-U{context_lines}']
         
@@ -306,9 +364,10 @@ class GitTools:
             return ToolResult(
                 success=True,
                 output=diff_info,
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
         
+        result.logs = self._logs.since(mark)
         return result
     
     def add(self, files: Optional[List[str]] = None, all: bool = False) -> ToolResult:
@@ -322,7 +381,8 @@ class GitTools:
         Returns:
             ToolResult with add result
         """
-        self._log(f"git.add called: files={files}, all={all}")
+        mark = self._logs.mark()
+        self._log("git.add called: files=%s, all=%s", files, all)
         
         args = ['add']
         
@@ -338,8 +398,9 @@ class GitTools:
         if result.success:
             self._log("git.add completed successfully")
         else:
-            self._log(f"git.add failed: {result.error}")
+            self._log("git.add failed: %s", result.error)
         
+        result.logs = self._logs.since(mark)
         return result
     
     def commit(self, message: str, author: Optional[str] = None) -> ToolResult:
@@ -353,7 +414,8 @@ class GitTools:
         Returns:
             ToolResult with commit result
         """
-        self._log(f"git.commit called: message={message[:50]}...")
+        mark = self._logs.mark()
+        self._log("git.commit called: message=%s...", message[:50])
         
         args = ['commit', '-m', message]
         
@@ -365,8 +427,9 @@ class GitTools:
         if result.success:
             self._log("git.commit completed successfully")
         else:
-            self._log(f"git.commit failed: {result.error}")
+            self._log("git.commit failed: %s", result.error)
         
+        result.logs = self._logs.since(mark)
         return result
     
     def configure(self, name: str, email: str, scope: str = "local") -> ToolResult:
@@ -381,7 +444,8 @@ class GitTools:
         Returns:
             ToolResult with configuration result
         """
-        self._log(f"git.configure called: name={name}, email={email}")
+        mark = self._logs.mark()
+        self._log("git.configure called: name=%s, email=%s", name, email)
         
         scope_flag = f"--{scope}"
         
@@ -396,10 +460,62 @@ class GitTools:
         if result.success:
             self._log("git.configure completed successfully")
         else:
-            self._log(f"git.configure failed: {result.error}")
+            self._log("git.configure failed: %s", result.error)
         
+        result.logs = self._logs.since(mark)
         return result
     
+    def bulk(self, ops: List[Tuple[str, Dict[str, Any]]]) -> List[ToolResult]:
+        """
+        Run several independent git operations concurrently.
+        
+        Intended for read-only operations (status, diff, ...) whose git
+        processes can overlap; operations that write to the index should
+        not be batched together. Each result's logs hold only the entries
+        written by its own operation.
+        
+        Args:
+            ops: List of (method name, keyword arguments) pairs,
+                e.g. [("status", {"short": True}), ("diff", {})]
+            
+        Returns:
+            List of ToolResults in the same order as ops
+        """
+        mark = self._logs.mark()
+        self._log("git.bulk called: %s", [name for name, _ in ops])
+        
+        futures = []
+        for name, kwargs in ops:
+            # Only public operations may be dispatched
+            method = None if name.startswith('_') or name == 'bulk' else getattr(self, name, None)
+            if not callable(method):
+                futures.append(None)
+            else:
+                futures.append(_EXECUTOR.submit(method, **kwargs))
+        
+        results = []
+        for (name, _), future in zip(ops, futures):
+            if future is None:
+                results.append(ToolResult(
+                    success=False,
+                    output=None,
+                    error=f"Unknown git operation: {name}",
+                    logs=self._logs.since(mark)
+                ))
+                continue
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(ToolResult(
+                    success=False,
+                    output=None,
+                    error=str(e),
+                    logs=self._logs.since(mark)
+                ))
+        
+        self._log("git.bulk completed: %s operations", len(results))
+        return results
+    
     def _parse_status(self, output: str, short: bool) -> Dict[str, Any]:
         """Parse git status output into structured data."""
         result = {
@@ -498,9 +614,9 @@ class GitTools:
         
         return result
     
-    def get_logs(self) -> List[str]:
-        """Get all logged operations."""
-        return self._logs.copy()
+    def get_logs(self) -> Tuple[str, ...]:
+        """Get the most recent logged operations (up to LOG_RING_SIZE) as an immutable tuple."""
+        return self._logs.snapshot()
     
     def clear_logs(self) -> None:
         """Clear operation logs."""
@@ -0,0 +1,75 @@
+"""
+Operation log shared by the Five Minds tools.
+
+Each tool instance keeps its most recent log entries in a LogRing. A caller
+takes a `mark()` before an operation and collects what the operation logged
+with `since(mark)` for its ToolResult. Entries are attributed to the thread
+that logged them, so operations running concurrently (e.g. GitTools.bulk)
+each get only their own entries.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, List, Tuple
+
+LOG_RING_SIZE = 1024  # most recent log entries kept per tool instance
+
+
+class LogRing:
+    """
+    Bounded, thread-safe log of recent tool operations.
+
+    The entries and the running count used for marks are only touched
+    under one lock, so they cannot drift apart when tools are called from
+    several threads.
+    """
+
+    def __init__(self, size: int = LOG_RING_SIZE):
+        """
+        Initialize the log ring.
+
+        Args:
+            size: Number of most recent entries to keep
+        """
+        # (sequence number, logging thread id, entry)
+        self._entries: Deque[Tuple[int, int, str]] = deque(maxlen=size)
+        self._count = 0  # total entries ever logged, including evicted ones
+        self._lock = threading.Lock()
+
+    def append(self, message: str) -> None:
+        """Add a log entry."""
+        with self._lock:
+            self._count += 1
+            self._entries.append((self._count, threading.get_ident(), message))
+
+    def mark(self) -> int:
+        """Get a mark for a later `since()` call."""
+        with self._lock:
+            return self._count
+
+    def since(self, mark: int) -> Tuple[str, ...]:
+        """
+        Get the entries the calling thread logged after `mark` was taken.
+        
+        Entries already evicted from the ring are not returned.
+        """
+        ident = threading.get_ident()
+        found: List[str] = []
+        with self._lock:
+            for seq, thread, message in reversed(self._entries):
+                if seq <= mark:
+                    break
+                if thread == ident:
+                    found.append(message)
+        found.reverse()
+        return tuple(found)
+
+    def snapshot(self) -> Tuple[str, ...]:
+        """Get all kept entries, oldest first."""
+        with self._lock:
+            return tuple(message for _, _, message in self._entries)
+
+    def clear(self) -> None:
+        """Drop all kept entries. Outstanding marks stay valid."""
+        with self._lock:
+            self._entries.clear()
@@ -11,10 +11,16 @@ Provides controlled access to repository operations:
 
 import os
 import re
+import mmap
+import array
+import shutil
+import uuid
+import stat
 import fnmatch
 import difflib
 import logging
-from typing import List, Optional, Dict, Any
+import subprocess
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 
@@ -23,6 +29,24 @@ logger = logging.getLogger(__name__)
 # Configuration
 DEFAULT_TIMEOUT = 30  # seconds
 MAX_FILE_SIZE = 1024 * 1024  # 1MB limit for reading files
+BINARY_SNIFF_SIZE = 8192  # a NUL byte in this many leading bytes marks a binary file
+
+# Characters that make a search pattern more than a plain literal
+_REGEX_META = re.compile(r'[.^$*+?()|\\\[\]{}]')
+
+# Pattern syntax that can match or look at a newline (escapes other than
+# \b \B \d \w \S, negated classes, DOTALL, literal newlines) or that keeps
+# what it consumed (atomic groups, possessive quantifiers). Run over the
+# whole buffer, such a pattern can miss a match its line has on its own.
+_LINE_ONLY_SYNTAX = re.compile(
+    r'\\(?![bBdwS])[A-Za-z0-9]|\[\^|\n|\(\?>|[*+?}]\+|\(\?[aiLmux]*s'
+)
+
+# Unified diff hunk header: @@ -start[,count] +start[,count] @@
+_HUNK_HEADER = re.compile(r'@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@')
+
+# Function context git appends to hunk headers, which difflib does not emit
+_HUNK_CONTEXT = re.compile(r'^(@@ -\S+ \+\S+ @@).*$', re.MULTILINE)
 
 
 @dataclass
@@ -32,6 +56,7 @@ class ToolResult:
     output: Any
     error: Optional[str] = None
     logs: List[str] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 class RepoTools:
@@ -50,6 +75,11 @@ class RepoTools:
         """
         self.repo_path = Path(repo_path).resolve()
         self._logs: List[str] = []
+        self._root = str(self.repo_path)
+        # Prefix every path inside the repo starts with ("/" for the root)
+        self._root_prefix = os.path.join(self._root, '')
+        # Path of repo_path inside its git work tree (see _git_prefix)
+        self._git_prefix_value: Optional[str] = None
         logger.info(f"RepoTools initialized for: {self.repo_path}")
     
     def _log(self, message: str) -> None:
@@ -61,6 +91,9 @@ class RepoTools:
         """
         Validate and resolve a path, ensuring it's within the repo.
         
+        Nothing is cached: the tree can change outside this instance, so
+        symlinks are resolved and the bounds checked on every call.
+        
         Args:
             path: Relative or absolute path
             
@@ -70,18 +103,13 @@ class RepoTools:
         Raises:
             ValueError: If path is outside repository
         """
-        if os.path.isabs(path):
-            resolved = Path(path).resolve()
-        else:
-            resolved = (self.repo_path / path).resolve()
+        resolved = os.path.realpath(os.path.join(self._root, path))
         
         # Security check: ensure path is within repo
-        try:
-            resolved.relative_to(self.repo_path)
-        except ValueError:
+        if resolved != self._root and not resolved.startswith(self._root_prefix):
             raise ValueError(f"Path '{path}' is outside repository bounds")
         
-        return resolved
+        return Path(resolved)
     
     def tree(self, path: str = ".", max_depth: int = 3, 
              ignore_patterns: Optional[List[str]] = None) -> ToolResult:
@@ -119,18 +147,22 @@ class RepoTools:
                 result = {"name": current.name, "type": "directory", "children": []}
                 
                 try:
-                    for item in sorted(current.iterdir()):
+                    # scandir entries carry the file type from the directory
+                    # read, so only regular files need a stat() for the size
+                    with os.scandir(current) as it:
+                        entries = sorted(it, key=lambda entry: entry.name)
+                    for entry in entries:
                         # Skip ignored patterns (use fnmatch for glob-style matching)
-                        if any(fnmatch.fnmatch(item.name, pattern) for pattern in ignore_patterns):
+                        if any(fnmatch.fnmatch(entry.name, pattern) for pattern in ignore_patterns):
                             continue
                         
-                        if item.is_dir():
-                            result["children"].append(build_tree(item, depth + 1))
+                        if entry.is_dir():
+                            result["children"].append(build_tree(current / entry.name, depth + 1))
                         else:
                             result["children"].append({
-                                "name": item.name,
+                                "name": entry.name,
                                 "type": "file",
-                                "size": item.stat().st_size
+                                "size": entry.stat().st_size
                             })
                 except PermissionError:
                     result["error"] = "Permission denied"
@@ -156,7 +188,9 @@ class RepoTools:
             )
     
     def search(self, pattern: str, path: str = ".", 
-               file_pattern: str = "*", case_sensitive: bool = True) -> ToolResult:
+               file_pattern: str = "*", case_sensitive: bool = True,
+               max_matches: Optional[int] = 1000,
+               max_matches_per_file: Optional[int] = None) -> ToolResult:
         """
         Search for content in files.
         
@@ -165,9 +199,16 @@ class RepoTools:
             path: Starting path for search
             file_pattern: Glob pattern for files to search
             case_sensitive: Whether search is case-sensitive
+            max_matches: Stop searching once this many matches were found
+                (None for no limit)
+            max_matches_per_file: Maximum number of matches reported per file
+                (None for no limit)
             
         Returns:
-            ToolResult with list of matches
+            ToolResult with list of matches. metadata["truncated"] is True
+            when max_matches cut the results short, and
+            metadata["truncated_files"] lists files with more matches than
+            max_matches_per_file.
         """
         self._log(f"repo.search called: pattern={pattern}, path={path}")
         
@@ -177,35 +218,86 @@ class RepoTools:
             flags = 0 if case_sensitive else re.IGNORECASE
             regex = re.compile(pattern, flags)
             
+            # Plain literals can be ruled out per file with a byte scan
+            # before decoding and splitting it into lines
+            literal = None
+            if case_sensitive and not _REGEX_META.search(pattern):
+                literal = pattern.encode('utf-8')
+            
+            # The same pattern run over the whole file finds candidate lines
+            # without a Python-level loop over every line. Patterns that can
+            # match across or next to a newline (see _LINE_ONLY_SYNTAX) may
+            # behave differently there, so those scan line by line
+            buffer_regex = None
+            if not _LINE_ONLY_SYNTAX.search(pattern):
+                buffer_regex = re.compile(pattern, flags | re.MULTILINE)
+            
             matches = []
+            truncated = False
+            truncated_files = []
             
             for file_path in start_path.rglob(file_pattern):
-                if file_path.is_dir():
+                # One stat answers both "is it a file" and "is it too large"
+                try:
+                    st = file_path.stat()
+                except OSError:
+                    continue
+                if not stat.S_ISREG(st.st_mode):
                     continue
                 
                 # Skip binary files and large files
-                if file_path.stat().st_size > MAX_FILE_SIZE:
+                if st.st_size > MAX_FILE_SIZE:
                     continue
                 
                 try:
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
-                    for line_num, line in enumerate(content.split('\n'), 1):
+                    data = file_path.read_bytes()
+                    if b'\0' in data[:BINARY_SNIFF_SIZE]:
+                        continue
+                    if literal is not None and literal not in data:
+                        continue
+                    
+                    content = data.decode('utf-8', errors='ignore')
+                    if buffer_regex is not None:
+                        lines = self._candidate_lines(content, buffer_regex)
+                    else:
+                        lines = enumerate(content.split('\n'), 1)
+                    file_matches = 0
+                    rel_path = None
+                    for line_num, line in lines:
                         if regex.search(line):
-                            rel_path = file_path.relative_to(self.repo_path)
+                            rel_path = rel_path or str(file_path.relative_to(self.repo_path))
+                            # A budget only counts as truncating once a
+                            # further match is actually dropped
+                            if max_matches_per_file is not None and file_matches >= max_matches_per_file:
+                                truncated_files.append(rel_path)
+                                break
+                            if max_matches is not None and len(matches) >= max_matches:
+                                truncated = True
+                                break
                             matches.append({
-                                "file": str(rel_path),
+                                "file": rel_path,
                                 "line": line_num,
                                 "content": line.strip()
                             })
+                            file_matches += 1
                 except (PermissionError, UnicodeDecodeError):
                     continue
-            
+                
+                if truncated:
+                    break
+            
+            if truncated:
+                self._log(f"repo.search stopped at max_matches={max_matches}")
+            if truncated_files:
+                self._log(f"repo.search hit max_matches_per_file={max_matches_per_file} "
+                          f"in {len(truncated_files)} files")
             self._log(f"repo.search found {len(matches)} matches")
             
             return ToolResult(
                 success=True,
                 output=matches,
-                logs=self._logs.copy()
+                logs=self._logs.copy(),
+                metadata={"truncated": truncated, "truncated_files": truncated_files}
             )
             
         except Exception as e:
@@ -261,23 +353,17 @@ class RepoTools:
                     logs=self._logs.copy()
                 )
             
-            content = file_path.read_text(encoding='utf-8')
-            lines = content.split('\n')
+            data, line_count, total_lines = self._read_lines(file_path, start_line, end_line)
             
-            if end_line is not None:
-                lines = lines[start_line:end_line]
-            else:
-                lines = lines[start_line:]
-            
-            self._log(f"repo.read completed: {len(lines)} lines")
+            self._log(f"repo.read completed: {line_count} lines")
             
             return ToolResult(
                 success=True,
                 output={
                     "path": path,
-                    "content": '\n'.join(lines),
-                    "lines": len(lines),
-                    "total_lines": len(content.split('\n'))
+                    "content": data.decode('utf-8'),
+                    "lines": line_count,
+                    "total_lines": total_lines
                 },
                 logs=self._logs.copy()
             )
@@ -291,19 +377,30 @@ class RepoTools:
                 logs=self._logs.copy()
             )
     
-    def apply_patch(self, patch: str, dry_run: bool = False) -> ToolResult:
+    def apply_patch(self, patch: str, dry_run: bool = False,
+                    force_python: bool = False) -> ToolResult:
         """
         Apply a unified diff patch.
         
+        The patch is piped to ``git apply`` when git is available, which
+        handles context matching, renames and file creation/deletion. The
+        built-in parser is used as a fallback. Both report the same keys
+        per file (file, status, hunks, additions, deletions), with paths
+        relative to the repository root.
+        
         Args:
             patch: Unified diff format patch string
             dry_run: If True, validate patch without applying
+            force_python: Always use the built-in patch parser
             
         Returns:
             ToolResult with patching results
         """
         self._log(f"repo.apply_patch called: dry_run={dry_run}")
         
+        if not force_python and shutil.which('git'):
+            return self._apply_patch_git(patch, dry_run)
+        
         try:
             # Parse the patch
             file_patches = self._parse_patch(patch)
@@ -320,12 +417,15 @@ class RepoTools:
             
             for file_info in file_patches:
                 file_path = self._validate_path(file_info['path'])
+                additions, deletions = self._count_changes(file_info['hunks'])
                 
                 if dry_run:
                     results.append({
                         "file": file_info['path'],
                         "status": "would_apply",
-                        "hunks": len(file_info['hunks'])
+                        "hunks": len(file_info['hunks']),
+                        "additions": additions,
+                        "deletions": deletions
                     })
                 else:
                     # Apply the patch
@@ -335,12 +435,14 @@ class RepoTools:
                         original = ""
                     
                     patched = self._apply_hunks(original, file_info['hunks'])
-                    file_path.write_text(patched)
+                    self._write_atomic(file_path, patched)
                     
                     results.append({
                         "file": file_info['path'],
                         "status": "applied",
-                        "hunks": len(file_info['hunks'])
+                        "hunks": len(file_info['hunks']),
+                        "additions": additions,
+                        "deletions": deletions
                     })
             
             self._log(f"repo.apply_patch completed: {len(results)} files")
@@ -360,6 +462,154 @@ class RepoTools:
                 logs=self._logs.copy()
             )
     
+    @staticmethod
+    def _write_atomic(file_path: Path, content: str) -> None:
+        """
+        Replace a file's contents so readers see either the old or new file.
+        
+        The content goes to a temporary sibling that is then renamed over
+        the target. An existing file's permission bits are kept; new files
+        get the usual umask-derived mode.
+        
+        Args:
+            file_path: Resolved destination path
+            content: New text content
+        """
+        tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        fd = os.open(str(tmp_path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+            try:
+                os.chmod(str(tmp_path), stat.S_IMODE(file_path.stat().st_mode))
+            except FileNotFoundError:
+                pass
+            os.replace(str(tmp_path), str(file_path))
+        except BaseException:
+            try:
+                os.unlink(str(tmp_path))
+            except OSError:
+                pass
+            raise
+    
+    def _apply_patch_git(self, patch: str, dry_run: bool) -> ToolResult:
+        """Apply a patch by piping it to ``git apply``."""
+        args = ['git', 'apply', '--whitespace=nowarn', '--numstat']
+        args.append('--check' if dry_run else '--apply')
+        args.append('-')
+        
+        try:
+            result = subprocess.run(
+                args,
+                cwd=str(self.repo_path),
+                input=patch.encode('utf-8'),
+                capture_output=True,
+                timeout=DEFAULT_TIMEOUT
+            )
+            
+            if result.returncode != 0:
+                error = result.stderr.decode('utf-8', errors='replace').strip()
+                self._log(f"repo.apply_patch failed: {error}")
+                return ToolResult(
+                    success=False,
+                    output=None,
+                    error=error or "git apply failed",
+                    logs=self._logs.copy()
+                )
+            
+            # --numstat reports "<added>\t<deleted>\t<path>" per file, with
+            # paths relative to the top of the git work tree
+            prefix = self._git_prefix()
+            hunk_counts = {
+                file_info['path']: len(file_info['hunks'])
+                for file_info in self._parse_patch(patch)
+            }
+            results = []
+            for line in result.stdout.decode('utf-8', errors='replace').splitlines():
+                parts = line.split('\t', 2)
+                if len(parts) != 3:
+                    continue
+                added, deleted, file_name = parts
+                if prefix and file_name.startswith(prefix):
+                    file_name = file_name[len(prefix):]
+                results.append({
+                    "file": file_name,
+                    "status": "would_apply" if dry_run else "applied",
+                    "hunks": hunk_counts.get(file_name, 0),
+                    "additions": int(added) if added.isdigit() else 0,
+                    "deletions": int(deleted) if deleted.isdigit() else 0
+                })
+            
+            if not results:
+                return ToolResult(
+                    success=False,
+                    output=None,
+                    error="No valid patches found in input",
+                    logs=self._logs.copy()
+                )
+            
+            self._log(f"repo.apply_patch completed: {len(results)} files")
+            
+            return ToolResult(
+                success=True,
+                output={"files": results, "dry_run": dry_run},
+                logs=self._logs.copy()
+            )
+            
+        except subprocess.TimeoutExpired:
+            error = f"git apply timed out after {DEFAULT_TIMEOUT} seconds"
+            self._log(f"repo.apply_patch failed: {error}")
+            return ToolResult(
+                success=False,
+                output=None,
+                error=error,
+                logs=self._logs.copy()
+            )
+            
+        except Exception as e:
+            self._log(f"repo.apply_patch failed: {str(e)}")
+            return ToolResult(
+                success=False,
+                output=None,
+                error=str(e),
+                logs=self._logs.copy()
+            )
+    
+    def _git_prefix(self) -> str:
+        """
+        Get repo_path relative to the top of its git work tree.
+        
+        ``git apply`` reports paths from the top of the work tree; this
+        prefix is stripped so they match the built-in parser's. Empty when
+        repo_path is the top level or not inside a work tree.
+        """
+        if self._git_prefix_value is None:
+            try:
+                result = subprocess.run(
+                    ['git', 'rev-parse', '--show-prefix'],
+                    cwd=str(self.repo_path),
+                    capture_output=True,
+                    timeout=DEFAULT_TIMEOUT
+                )
+                prefix = result.stdout.decode('utf-8', errors='replace').strip()
+                self._git_prefix_value = prefix if result.returncode == 0 else ''
+            except (OSError, subprocess.TimeoutExpired):
+                self._git_prefix_value = ''
+        return self._git_prefix_value
+    
+    @staticmethod
+    def _count_changes(hunks: List[List[str]]) -> Tuple[int, int]:
+        """Count added and deleted lines in parsed hunks."""
+        additions = deletions = 0
+        for hunk in hunks:
+            for line in hunk[1:]:
+                # Same line classification as _apply_hunks
+                if line.startswith('+') and not line.startswith('+++'):
+                    additions += 1
+                elif line.startswith('-') and not line.startswith('---'):
+                    deletions += 1
+        return additions, deletions
+    
     def diff(self, path1: str, path2: Optional[str] = None, 
              context_lines: int = 3) -> ToolResult:
         """
@@ -386,8 +636,7 @@ class RepoTools:
                     logs=self._logs.copy()
                 )
             
-            content1 = file1.read_text().splitlines(keepends=True)
-            
+            file2 = None
             if path2:
                 file2 = self._validate_path(path2)
                 if not file2.exists():
@@ -397,21 +646,30 @@ class RepoTools:
                         error=f"File does not exist: {path2}",
                         logs=self._logs.copy()
                     )
-                content2 = file2.read_text().splitlines(keepends=True)
-                label2 = path2
-            else:
-                # Diff against empty (show all as additions)
-                content2 = []
-                label2 = "/dev/null"
-            
-            diff_output = difflib.unified_diff(
-                content2, content1,
-                fromfile=label2,
-                tofile=path1,
-                n=context_lines
-            )
             
-            diff_text = ''.join(diff_output)
+            if shutil.which('git'):
+                diff_text = self._diff_files_git(
+                    file2, file1, path2 if file2 is not None else "/dev/null",
+                    path1, context_lines
+                )
+            else:
+                content1 = file1.read_text().splitlines(keepends=True)
+                if file2 is not None:
+                    content2 = file2.read_text().splitlines(keepends=True)
+                    label2 = path2
+                else:
+                    # Diff against empty (show all as additions)
+                    content2 = []
+                    label2 = "/dev/null"
+                
+                diff_output = difflib.unified_diff(
+                    content2, content1,
+                    fromfile=label2,
+                    tofile=path1,
+                    n=context_lines
+                )
+                
+                diff_text = ''.join(diff_output)
             
             self._log(f"repo.diff completed")
             
@@ -430,6 +688,128 @@ class RepoTools:
                 logs=self._logs.copy()
             )
     
+    def _diff_files_git(self, old: Optional[Path], new: Path, old_label: str,
+                        new_label: str, context_lines: int) -> str:
+        """
+        Diff two files with ``git diff --no-index``.
+        
+        The output is shaped like difflib.unified_diff's: git's extended
+        header lines (diff --git, index, modes) and the function context
+        after hunk headers are dropped, and the ---/+++ labels are the
+        strings the caller passed. Unlike difflib, a missing final newline
+        is marked with git's "\\ No newline at end of file" line, and hunks
+        may be split differently.
+        
+        Args:
+            old: Original file (None to diff against /dev/null)
+            new: Modified file
+            old_label: Label for the --- line
+            new_label: Label for the +++ line
+            context_lines: Number of context lines in diff
+            
+        Returns:
+            Unified diff text (empty if the files are identical)
+            
+        Raises:
+            RuntimeError: If git fails
+        """
+        old_arg = os.path.relpath(old, self.repo_path) if old is not None else os.devnull
+        new_arg = os.path.relpath(new, self.repo_path)
+        
+        result = subprocess.run(
+            ['git', 'diff', '--no-index', '--no-color', '--no-ext-diff',
+             '--no-prefix', f'--unified={context_lines}', '--', old_arg, new_arg],
+            cwd=str(self.repo_path),
+            capture_output=True,
+            timeout=DEFAULT_TIMEOUT
+        )
+        
+        # git diff exits with 1 when the files differ
+        if result.returncode not in (0, 1):
+            raise RuntimeError(
+                result.stderr.decode('utf-8', errors='replace').strip() or "git diff failed"
+            )
+        
+        output = result.stdout.decode('utf-8', errors='replace')
+        # Binary files have no ---/+++ lines; git's message is kept as is
+        start = output.find('\n--- ')
+        if start == -1:
+            return output
+        body = output[start + 1:].split('\n', 2)[2]
+        body = _HUNK_CONTEXT.sub(r'\1', body)
+        return f"--- {old_label}\n+++ {new_label}\n{body}"
+    
+    @staticmethod
+    def _candidate_lines(content: str, buffer_regex: "re.Pattern"):
+        """
+        Yield the lines of a file in which a multiline search finds a match.
+        
+        Each line with a per-line match also contains the start of a
+        whole-buffer match, so no matching line is skipped; callers still
+        check each candidate line against the per-line pattern.
+        
+        Args:
+            content: File contents
+            buffer_regex: Search pattern compiled with re.MULTILINE
+            
+        Yields:
+            (1-based line number, line text) tuples, in file order
+        """
+        pos = 0
+        line_num = 1
+        end = len(content)
+        while pos <= end:
+            match = buffer_regex.search(content, pos)
+            if match is None:
+                return
+            start = content.rfind('\n', pos, match.start()) + 1 or pos
+            line_num += content.count('\n', pos, start)
+            stop = content.find('\n', match.start())
+            if stop == -1:
+                stop = end
+            yield line_num, content[start:stop]
+            pos = stop + 1
+            line_num += 1
+    
+    def _read_lines(self, file_path: Path, start_line: int,
+                    end_line: Optional[int]) -> Tuple[bytes, int, int]:
+        """
+        Read a range of lines from a file without splitting it into a list.
+        
+        The file is memory-mapped and the requested range is sliced out in one
+        copy, using the offsets of the newlines that bound it.
+        
+        Returns:
+            Tuple of (raw bytes, number of lines returned, total lines in file)
+        """
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap refuses empty files; an empty file is a single empty line
+                start, end, _ = slice(start_line, end_line).indices(1)
+                return b'', max(end - start, 0), 1
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                offsets = self._newline_offsets(mm)
+                total_lines = len(offsets) + 1
+                start, end, _ = slice(start_line, end_line).indices(total_lines)
+                if end <= start:
+                    return b'', 0, total_lines
+                
+                # Line i spans [offsets[i-1] + 1, offsets[i]); the last line runs to EOF
+                begin = offsets[start - 1] + 1 if start > 0 else 0
+                stop = offsets[end - 1] if end - 1 < len(offsets) else len(mm)
+                return mm[begin:stop], end - start, total_lines
+    
+    @staticmethod
+    def _newline_offsets(mm: mmap.mmap) -> array.array:
+        """Return the byte offset of every newline in a mapped file."""
+        offsets = array.array('q')
+        i = mm.find(b'\n')
+        while i != -1:
+            offsets.append(i)
+            i = mm.find(b'\n', i + 1)
+        return offsets
+    
     def _parse_patch(self, patch: str) -> List[Dict[str, Any]]:
         """Parse a unified diff patch into structured data."""
         file_patches = []
@@ -497,8 +877,7 @@ class RepoTools:
             # Parse hunk header to get line numbers
             header = hunk[0]
             # Format: @@ -start,count +start,count @@
-            import re
-            match = re.match(r'@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@', header)
+            match = _HUNK_HEADER.match(header)
             if not match:
                 continue
             
@@ -11,21 +11,109 @@ All commands are:
 - Timeout-bound
 """
 
+import importlib.util
 import json
+import functools
 import os
 import re
+import shlex
 import shutil
+import selectors
 import subprocess
+import sys
+import time
 import logging
-from typing import List, Optional, Dict, Any
+from collections import deque
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Mapping, NamedTuple, Sequence, Tuple
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+
+from .logring import LogRing
+
+try:
+    import orjson  # optional, faster package.json parsing
+except ImportError:
+    orjson = None
+
+__all__ = ["ShellTools", "ToolResult", "CommandRecord"]
 
 logger = logging.getLogger(__name__)
 
 # Configuration
 DEFAULT_TIMEOUT = 30  # seconds
 MAX_OUTPUT_LENGTH = 1024 * 1024  # 1MB max output/error length
+READ_CHUNK_SIZE = 65536  # bytes read from a child pipe at a time
+TRUNCATION_MARKER = "\n... [output truncated]"
+HISTORY_CAPACITY = 1024  # default number of command records kept
+
+# Selector for draining child pipes. For the one or two descriptors watched
+# per command, poll() beats epoll (DefaultSelector on Linux): it needs no
+# epoll_create/epoll_ctl/close calls per command, only the wait itself.
+_PipeSelector = getattr(selectors, "PollSelector", selectors.DefaultSelector)
+
+# Bytes at the end of test output searched first for the result summary
+SUMMARY_TAIL_SIZE = 4096
+
+_PYTEST_COUNTS_RE = re.compile(
+    r'(?P<passed>\d+) passed|(?P<failed>\d+) failed|(?P<skipped>\d+) skipped'
+)
+_JS_COUNTS_RE = re.compile(r'(?P<passed>\d+) passed|(?P<failed>\d+) failed', re.IGNORECASE)
+
+# Long-lived pytest process used by run_tests(persistent=True). It reads one
+# JSON argument list per line, runs pytest.main() on it, then prints a marker
+# with the exit code. Modules imported by a run are dropped afterwards so the
+# next run sees fresh project code; only interpreter and pytest startup is
+# saved.
+_BATCH_MARKER = b"===FIVEMINDS_DONE exit="
+_PYTEST_HARNESS = """
+import json, sys, traceback
+import pytest
+_base = set(sys.modules)
+for _line in sys.stdin:
+    try:
+        _rc = pytest.main(json.loads(_line))
+    except SystemExit as _exc:
+        _rc = _exc.code if isinstance(_exc.code, int) else 1
+    except BaseException:
+        traceback.print_exc()
+        _rc = 1
+    for _name in [n for n in sys.modules if n not in _base]:
+        del sys.modules[_name]
+    sys.stderr.flush()
+    sys.stdout.write("\\n===FIVEMINDS_DONE exit=%d===\\n" % int(_rc))
+    sys.stdout.flush()
+"""
+
+
+@functools.lru_cache(maxsize=256)
+def _which_cached(command: str, path_env: Optional[str],
+                  pathext_env: str) -> Optional[str]:
+    """
+    Memoized shutil.which.
+    
+    PATH and PATHEXT are part of the key so that changing either one
+    invalidates earlier lookups.
+    """
+    return shutil.which(command, path=path_env)
+
+
+def _decode_capped(data: bytes) -> str:
+    """Decode at most MAX_OUTPUT_LENGTH bytes of output, marking any truncation."""
+    if len(data) > MAX_OUTPUT_LENGTH:
+        return data[:MAX_OUTPUT_LENGTH].decode("utf-8", errors="replace") + TRUNCATION_MARKER
+    return data.decode("utf-8", errors="replace")
+
+
+class CommandRecord(NamedTuple):
+    """One entry in ShellTools' command history."""
+    command: str
+    working_dir: str
+    timeout: int
+    exit_code: Optional[int] = None
+    output: Optional[str] = None
+    error: Optional[str] = None
+    builtin: bool = False
 
 
 @dataclass
@@ -34,7 +122,7 @@ class ToolResult:
     success: bool
     output: Any
     error: Optional[str] = None
-    logs: List[str] = field(default_factory=list)
+    logs: Sequence[str] = ()
 
 
 class ShellTools:
@@ -47,24 +135,70 @@ class ShellTools:
     - Timeout-bound
     """
     
-    def __init__(self, working_dir: str, timeout: int = DEFAULT_TIMEOUT):
+    def __init__(self, working_dir: str, timeout: int = DEFAULT_TIMEOUT,
+                 history_capacity: int = HISTORY_CAPACITY,
+                 capture_logs: bool = True,
+                 enable_builtins: bool = True):
         """
         Initialize shell tools.
         
         Args:
             working_dir: Working directory for command execution
             timeout: Default timeout for commands in seconds
+            history_capacity: Number of most recent command records to keep
+            capture_logs: Keep log entries for get_logs() and ToolResult.logs.
+                Disable when results' logs are never read to skip formatting
+                them; the module logger still receives debug records.
+            enable_builtins: Answer which/pwd/true/false/echo in-process
+                instead of spawning them. Set to False to always run the
+                real executables.
         """
         self.working_dir = Path(working_dir).resolve()
+        # Shared by every history record and used as the child cwd
+        self._working_dir_str = sys.intern(str(self.working_dir))
         self.timeout = timeout
-        self._logs: List[str] = []
-        self._command_history: List[Dict[str, Any]] = []
+        self.capture_logs = capture_logs
+        self.enable_builtins = enable_builtins
+        # Handlers return (exit code, stdout, stderr), or None to spawn instead
+        self._builtins = {
+            "which": self._builtin_which,
+            "pwd": self._builtin_pwd,
+            "true": lambda args: (0, "", ""),
+            "false": lambda args: (1, "", ""),
+            "echo": self._builtin_echo,
+        }
+        self._logs = LogRing()
+        self.history_capacity = history_capacity
+        self._command_history: deque = deque(maxlen=history_capacity)
+        self._base_env: Mapping[str, str] = MappingProxyType(os.environ.copy())
+        self._batch_runners: Dict[str, subprocess.Popen] = {}
+        # package.json path -> (mtime_ns, size, parsed contents)
+        self._pkgjson_cache: Dict[str, Tuple[int, int, Any]] = {}
         logger.info(f"ShellTools initialized: working_dir={self.working_dir}, timeout={timeout}s")
     
-    def _log(self, message: str) -> None:
-        """Add a log entry."""
-        self._logs.append(message)
-        logger.debug(message)
+    def _log(self, message: str, *args: Any) -> None:
+        """
+        Add a log entry, %-formatting `message` with `args`.
+        
+        Formatting is skipped entirely when log capture is off and the
+        module logger would drop the debug record anyway.
+        """
+        if self.capture_logs:
+            if args:
+                message = message % args
+            self._logs.append(message)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(message)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(message, *args)
+    
+    def _record_command(self, command: str, timeout: int,
+                        exit_code: Optional[int] = None, output: Optional[str] = None,
+                        error: Optional[str] = None, builtin: bool = False) -> None:
+        """Append a command to the bounded history."""
+        self._command_history.append(CommandRecord(
+            command, self._working_dir_str, timeout, exit_code, output, error, builtin
+        ))
     
     def run(self, command: str, args: Optional[List[str]] = None,
             env: Optional[Dict[str, str]] = None,
@@ -88,103 +222,271 @@ class ShellTools:
         
         cmd_timeout = timeout or self.timeout
         full_cmd = [command] + args
-        cmd_str = ' '.join(full_cmd)
+        cmd_str = sys.intern(shlex.join(full_cmd))
         
-        self._log(f"shell.run called: {cmd_str}")
+        mark = self._logs.mark()
+        self._log("shell.run called: %s", cmd_str)
         
-        # Prepare environment
-        cmd_env = os.environ.copy()
-        if env:
-            cmd_env.update(env)
+        # Trivial commands are answered in-process when their output would
+        # be identical to the real utility's
+        if self.enable_builtins and capture_output and not env:
+            handler = self._builtins.get(command)
+            builtin = handler(args) if handler else None
+            if builtin is not None:
+                return self._builtin_result(cmd_str, cmd_timeout, builtin, mark)
         
-        # Record command
-        cmd_record = {
-            "command": cmd_str,
-            "working_dir": str(self.working_dir),
-            "timeout": cmd_timeout,
-            "exit_code": None,
-            "output": None,
-            "error": None
-        }
+        # Prepare environment (the cached base is shared when nothing is added)
+        if env:
+            cmd_env = {**self._base_env, **env}
+        else:
+            cmd_env = self._base_env
         
         try:
             # Execute command
-            result = subprocess.run(
-                full_cmd,
-                cwd=str(self.working_dir),
-                env=cmd_env,
-                capture_output=capture_output,
-                text=True,
-                timeout=cmd_timeout
-            )
-            
-            # Truncate output if too large
-            stdout = result.stdout or ""
-            stderr = result.stderr or ""
-            
-            if len(stdout) > MAX_OUTPUT_LENGTH:
-                stdout = stdout[:MAX_OUTPUT_LENGTH] + "\n... [output truncated]"
-            if len(stderr) > MAX_OUTPUT_LENGTH:
-                stderr = stderr[:MAX_OUTPUT_LENGTH] + "\n... [output truncated]"
+            if capture_output and os.name == "posix":
+                # Output is capped at MAX_OUTPUT_LENGTH bytes while it is read
+                returncode, out, err, out_truncated, err_truncated = self._fast_spawn(
+                    full_cmd, cmd_env, cmd_timeout
+                )
+                stdout = out.decode("utf-8", errors="replace")
+                stderr = err.decode("utf-8", errors="replace")
+                if out_truncated:
+                    stdout += TRUNCATION_MARKER
+                if err_truncated:
+                    stderr += TRUNCATION_MARKER
+            else:
+                result = subprocess.run(
+                    full_cmd,
+                    cwd=self._working_dir_str,
+                    env=cmd_env,
+                    capture_output=capture_output,
+                    timeout=cmd_timeout
+                )
+                returncode = result.returncode
+                # Truncate the raw bytes so only the kept part is decoded
+                stdout = _decode_capped(result.stdout or b"")
+                stderr = _decode_capped(result.stderr or b"")
             
-            cmd_record["exit_code"] = result.returncode
-            cmd_record["output"] = stdout
-            cmd_record["error"] = stderr
-            self._command_history.append(cmd_record)
+            self._record_command(cmd_str, cmd_timeout, returncode, stdout, stderr)
             
-            self._log(f"shell.run completed: exit_code={result.returncode}")
+            self._log("shell.run completed: exit_code=%s", returncode)
             
             return ToolResult(
-                success=result.returncode == 0,
+                success=returncode == 0,
                 output={
                     "command": cmd_str,
-                    "exit_code": result.returncode,
+                    "exit_code": returncode,
                     "stdout": stdout,
                     "stderr": stderr
                 },
-                error=stderr if result.returncode != 0 else None,
-                logs=self._logs.copy()
+                error=stderr if returncode != 0 else None,
+                logs=self._logs.since(mark)
             )
             
         except subprocess.TimeoutExpired as e:
             error_msg = f"Command timed out after {cmd_timeout} seconds"
-            cmd_record["error"] = error_msg
-            self._command_history.append(cmd_record)
-            self._log(f"shell.run timeout: {error_msg}")
+            self._record_command(cmd_str, cmd_timeout, error=error_msg)
+            self._log("shell.run timeout: %s", error_msg)
             
             return ToolResult(
                 success=False,
                 output={"command": cmd_str, "exit_code": None},
                 error=error_msg,
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
             
         except FileNotFoundError:
             error_msg = f"Command not found: {command}"
-            cmd_record["error"] = error_msg
-            self._command_history.append(cmd_record)
-            self._log(f"shell.run failed: {error_msg}")
+            self._record_command(cmd_str, cmd_timeout, error=error_msg)
+            self._log("shell.run failed: %s", error_msg)
             
             return ToolResult(
                 success=False,
                 output={"command": cmd_str, "exit_code": 127},
                 error=error_msg,
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
             
         except Exception as e:
             error_msg = f"Command execution failed: {str(e)}"
-            cmd_record["error"] = error_msg
-            self._command_history.append(cmd_record)
-            self._log(f"shell.run failed: {error_msg}")
+            self._record_command(cmd_str, cmd_timeout, error=error_msg)
+            self._log("shell.run failed: %s", error_msg)
             
             return ToolResult(
                 success=False,
                 output={"command": cmd_str, "exit_code": None},
                 error=error_msg,
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
     
+    def _builtin_which(self, args: List[str]) -> Optional[Tuple[int, str, str]]:
+        """
+        `which NAME...` against the PATH commands are spawned with.
+        
+        Lookups that depend on the current directory (names with a path
+        separator, empty or relative PATH entries) are left to the real
+        binary: shutil.which would resolve them against the server's cwd
+        instead of working_dir.
+        """
+        if not args or any(arg.startswith("-") for arg in args):
+            return None
+        path_env = self._base_env.get("PATH")
+        pathext_env = self._base_env.get("PATHEXT", "")
+        if os.name != "posix" or not path_env:
+            return None
+        if any(os.sep in arg or (os.altsep and os.altsep in arg) for arg in args):
+            return None
+        if not all(os.path.isabs(entry) for entry in path_env.split(os.pathsep)):
+            return None
+        found = []
+        for arg in args:
+            path = _which_cached(arg, path_env, pathext_env)
+            if path:
+                found.append(path + "\n")
+        return (0 if len(found) == len(args) else 1, "".join(found), "")
+    
+    def _builtin_pwd(self, args: List[str]) -> Optional[Tuple[int, str, str]]:
+        """`pwd` without options; working_dir is already resolved."""
+        if args:
+            return None
+        return (0, f"{self.working_dir}\n", "")
+    
+    def _builtin_echo(self, args: List[str]) -> Optional[Tuple[int, str, str]]:
+        """`echo` without options (-n/-e/-E are left to the real binary)."""
+        if args and args[0].startswith("-"):
+            return None
+        return (0, " ".join(args) + "\n", "")
+    
+    def _builtin_result(self, cmd_str: str, cmd_timeout: int,
+                        builtin: Tuple[int, str, str], mark: int) -> ToolResult:
+        """Record and wrap the result of an in-process builtin like run() does."""
+        returncode, stdout, stderr = builtin
+        if len(stdout) > MAX_OUTPUT_LENGTH:
+            stdout = stdout[:MAX_OUTPUT_LENGTH] + TRUNCATION_MARKER
+        
+        self._record_command(cmd_str, cmd_timeout, returncode, stdout, stderr, builtin=True)
+        self._log("shell.run completed (builtin): exit_code=%s", returncode)
+        
+        return ToolResult(
+            success=returncode == 0,
+            output={
+                "command": cmd_str,
+                "exit_code": returncode,
+                "stdout": stdout,
+                "stderr": stderr
+            },
+            error=stderr if returncode != 0 else None,
+            logs=self._logs.since(mark)
+        )
+    
+    def _fast_spawn(self, full_cmd: List[str], env: Mapping[str, str],
+                    timeout: float) -> Tuple[int, bytearray, bytearray, bool, bool]:
+        """
+        Spawn a command and collect its output (POSIX only).
+        
+        A lighter path than subprocess.run: both pipes are drained by a
+        single selector loop against a monotonic deadline. At most
+        MAX_OUTPUT_LENGTH bytes are kept per pipe; anything beyond that is
+        read and discarded so the child never blocks on a full pipe.
+        
+        Args:
+            full_cmd: Command and arguments
+            env: Environment for the child
+            timeout: Seconds before the child is killed
+            
+        Returns:
+            Tuple of (exit code, stdout buffer, stderr buffer,
+            stdout truncated, stderr truncated). The buffers are returned
+            as-is so they can be decoded without an intermediate copy.
+            
+        Raises:
+            subprocess.TimeoutExpired: If the command exceeds the timeout
+        """
+        deadline = time.monotonic() + timeout
+        proc = subprocess.Popen(
+            full_cmd,
+            cwd=self._working_dir_str,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        
+        out_fd = proc.stdout.fileno()
+        err_fd = proc.stderr.fileno()
+        try:
+            buffers, truncated = self._drain_pipes(
+                [out_fd, err_fd], deadline, MAX_OUTPUT_LENGTH
+            )
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(full_cmd, timeout)
+            returncode = proc.wait(timeout=remaining)
+        except subprocess.TimeoutExpired as e:
+            proc.kill()
+            proc.wait()
+            raise subprocess.TimeoutExpired(full_cmd, timeout) from e
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            proc.stdout.close()
+            proc.stderr.close()
+        
+        return (
+            returncode,
+            buffers[out_fd],
+            buffers[err_fd],
+            truncated[out_fd],
+            truncated[err_fd]
+        )
+    
+    @staticmethod
+    def _drain_pipes(fds: List[int], deadline: float,
+                     cap: int) -> Tuple[Dict[int, bytearray], Dict[int, bool]]:
+        """
+        Read pipes until they all reach EOF, keeping at most `cap` bytes each.
+        
+        Both pipes are multiplexed on one poll() selector, so no
+        helper threads are needed. Data beyond the cap is read and dropped.
+        
+        Args:
+            fds: Read ends of the pipes
+            deadline: time.monotonic() value after which to give up
+            cap: Maximum bytes kept per pipe
+            
+        Returns:
+            Tuple of (buffer per fd, whether each fd overflowed the cap)
+            
+        Raises:
+            subprocess.TimeoutExpired: If the deadline passes first
+        """
+        buffers = {fd: bytearray() for fd in fds}
+        truncated = {fd: False for fd in fds}
+        with _PipeSelector() as selector:
+            for fd in fds:
+                selector.register(fd, selectors.EVENT_READ)
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired("", 0)
+                for key, _ in selector.select(remaining):
+                    data = os.read(key.fd, READ_CHUNK_SIZE)
+                    if not data:
+                        selector.unregister(key.fd)
+                        continue
+                    buf = buffers[key.fd]
+                    room = cap - len(buf)
+                    if len(data) <= room:
+                        buf += data
+                    else:
+                        # Keep what fits without copying the chunk first
+                        truncated[key.fd] = True
+                        if room:
+                            buf += memoryview(data)[:room]
+        return buffers, truncated
+    
     def which(self, command: str) -> ToolResult:
         """
         Locate a command.
@@ -195,34 +497,39 @@ class ShellTools:
         Returns:
             ToolResult with command path if found
         """
-        self._log(f"shell.which called: {command}")
+        mark = self._logs.mark()
+        self._log("shell.which called: %s", command)
         
         try:
-            path = shutil.which(command)
+            hits = _which_cached.cache_info().hits
+            path = _which_cached(
+                command, os.environ.get("PATH"), os.environ.get("PATHEXT", "")
+            )
+            cached = _which_cached.cache_info().hits > hits
             
             if path:
-                self._log(f"shell.which found: {path}")
+                self._log("shell.which found: %s%s", path, " (cached)" if cached else "")
                 return ToolResult(
                     success=True,
                     output={"command": command, "path": path},
-                    logs=self._logs.copy()
+                    logs=self._logs.since(mark)
                 )
             else:
-                self._log(f"shell.which not found: {command}")
+                self._log("shell.which not found: %s", command)
                 return ToolResult(
                     success=False,
                     output={"command": command, "path": None},
                     error=f"Command not found: {command}",
-                    logs=self._logs.copy()
+                    logs=self._logs.since(mark)
                 )
                 
         except Exception as e:
-            self._log(f"shell.which failed: {str(e)}")
+            self._log("shell.which failed: %s", e)
             return ToolResult(
                 success=False,
                 output={"command": command, "path": None},
                 error=str(e),
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
     
     def detect_test_framework(self) -> ToolResult:
@@ -232,6 +539,7 @@ class ShellTools:
         Returns:
             ToolResult with detected framework and test command
         """
+        mark = self._logs.mark()
         self._log("shell.detect_test_framework called")
         
         detected = {
@@ -240,41 +548,47 @@ class ShellTools:
             "args": []
         }
         
+        # One directory listing instead of a stat() per marker file
+        try:
+            with os.scandir(self.working_dir) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:
+            entries = {}
+        
         # Check for Python pytest
-        if (self.working_dir / "pytest.ini").exists() or \
-           (self.working_dir / "pyproject.toml").exists() or \
-           (self.working_dir / "setup.py").exists():
+        if "pytest.ini" in entries or \
+           "pyproject.toml" in entries or \
+           "setup.py" in entries:
             if self.which("pytest").success:
                 detected = {"framework": "pytest", "command": "pytest", "args": ["-v"]}
         
         # Check for Node.js/npm test
-        package_json = self.working_dir / "package.json"
-        if package_json.exists():
+        if "package.json" in entries:
             try:
-                with open(package_json) as f:
-                    pkg = json.load(f)
-                    if "scripts" in pkg and "test" in pkg["scripts"]:
-                        detected = {"framework": "npm", "command": "npm", "args": ["test"]}
-                    # Check for playwright
-                    if "scripts" in pkg and any("playwright" in str(v) for v in pkg["scripts"].values()):
-                        detected = {"framework": "playwright", "command": "npx", "args": ["playwright", "test"]}
+                pkg = self._load_package_json(entries["package.json"])
+                scripts = pkg.get("scripts") or {}
+                if "test" in scripts:
+                    detected = {"framework": "npm", "command": "npm", "args": ["test"]}
+                # Check for playwright
+                if "playwright" in " ".join(map(str, scripts.values())):
+                    detected = {"framework": "playwright", "command": "npx", "args": ["playwright", "test"]}
             except Exception:
                 pass
         
         # Check for Go tests
-        if (self.working_dir / "go.mod").exists():
+        if "go.mod" in entries:
             detected = {"framework": "go", "command": "go", "args": ["test", "./..."]}
         
         # Check for Cargo/Rust tests
-        if (self.working_dir / "Cargo.toml").exists():
+        if "Cargo.toml" in entries:
             detected = {"framework": "cargo", "command": "cargo", "args": ["test"]}
         
         if detected["framework"]:
-            self._log(f"shell.detect_test_framework found: {detected['framework']}")
+            self._log("shell.detect_test_framework found: %s", detected["framework"])
             return ToolResult(
                 success=True,
                 output=detected,
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
         else:
             self._log("shell.detect_test_framework: no framework detected")
@@ -282,19 +596,43 @@ class ShellTools:
                 success=False,
                 output=detected,
                 error="No test framework detected",
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
     
-    def run_tests(self, timeout: int = 300) -> ToolResult:
+    def _load_package_json(self, entry: os.DirEntry) -> Any:
+        """
+        Parse a package.json, reusing the last result while the file is unchanged.
+        
+        The cache is keyed on modification time and size. orjson is used
+        when installed, the json module otherwise.
+        """
+        st = entry.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        hit = self._pkgjson_cache.get(entry.path)
+        if hit is not None and hit[:2] == key:
+            return hit[2]
+        
+        with open(entry.path, "rb") as f:
+            data = f.read()
+        pkg = orjson.loads(data) if orjson is not None else json.loads(data)
+        self._pkgjson_cache[entry.path] = (key[0], key[1], pkg)
+        return pkg
+    
+    def run_tests(self, timeout: int = 300, persistent: bool = False) -> ToolResult:
         """
         Detect and run the project's test suite.
         
         Args:
             timeout: Timeout for test execution in seconds (default: 5 minutes)
+            persistent: Run pytest suites in a long-lived worker process that
+                is reused by later calls, saving interpreter startup. The
+                worker uses this interpreter, so pytest must be importable
+                here. Call close() to stop it.
             
         Returns:
             ToolResult with test results
         """
+        mark = self._logs.mark()
         self._log("shell.run_tests called")
         
         # Detect test framework
@@ -305,22 +643,27 @@ class ShellTools:
                 success=False,
                 output={"tests_run": False},
                 error="No test framework detected",
-                logs=self._logs.copy()
+                logs=self._logs.since(mark)
             )
         
         framework_info = detection.output
         command = framework_info["command"]
         args = framework_info["args"]
         
-        self._log(f"shell.run_tests executing: {command} {' '.join(args)}")
+        cmd_str = shlex.join([command] + args)
+        self._log("shell.run_tests executing: %s", cmd_str)
         
         # Run the tests
-        result = self.run(command, args, timeout=timeout)
+        if (persistent and framework_info["framework"] == "pytest"
+                and importlib.util.find_spec("pytest") is not None):
+            result = self._run_batch("pytest", args, timeout)
+        else:
+            result = self.run(command, args, timeout=timeout)
         
         # Parse test results
         test_output = {
             "framework": framework_info["framework"],
-            "command": f"{command} {' '.join(args)}",
+            "command": cmd_str,
             "exit_code": result.output.get("exit_code") if result.output else None,
             "stdout": result.output.get("stdout", "") if result.output else "",
             "stderr": result.output.get("stderr", "") if result.output else "",
@@ -339,45 +682,204 @@ class ShellTools:
             success=result.success,
             output=test_output,
             error=result.error,
-            logs=self._logs.copy()
+            logs=self._logs.since(mark)
         )
     
+    def _run_batch(self, framework: str, args: List[str], timeout: int) -> ToolResult:
+        """
+        Run a test command in the pooled worker for `framework`.
+        
+        The worker is started on first use. Its stderr is merged into
+        stdout, and the output is read up to the completion marker.
+        
+        Returns:
+            ToolResult shaped like the one returned by run()
+        """
+        cmd_str = sys.intern(f"{shlex.join([framework] + args)} (persistent)")
+        mark = self._logs.mark()
+        self._log("shell.run_tests using persistent runner: %s", framework)
+        
+        proc = self._batch_runners.get(framework)
+        try:
+            if proc is None or proc.poll() is not None:
+                proc = subprocess.Popen(
+                    [sys.executable, "-c", _PYTEST_HARNESS],
+                    cwd=self._working_dir_str,
+                    env=self._base_env,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    bufsize=0
+                )
+                self._batch_runners[framework] = proc
+            
+            proc.stdin.write(json.dumps(args).encode("utf-8") + b"\n")
+            returncode, output = self._read_batch_output(proc, timeout)
+        except subprocess.TimeoutExpired:
+            self._stop_batch_runner(framework)
+            error_msg = f"Command timed out after {timeout} seconds"
+            self._record_command(cmd_str, timeout, error=error_msg)
+            self._log("shell.run timeout: %s", error_msg)
+            return ToolResult(
+                success=False,
+                output={"command": cmd_str, "exit_code": None},
+                error=error_msg,
+                logs=self._logs.since(mark)
+            )
+        except (OSError, ValueError) as e:
+            self._stop_batch_runner(framework)
+            error_msg = f"Command execution failed: {str(e)}"
+            self._record_command(cmd_str, timeout, error=error_msg)
+            self._log("shell.run failed: %s", error_msg)
+            return ToolResult(
+                success=False,
+                output={"command": cmd_str, "exit_code": None},
+                error=error_msg,
+                logs=self._logs.since(mark)
+            )
+        
+        stdout = _decode_capped(output)
+        
+        self._record_command(cmd_str, timeout, returncode, stdout, "")
+        self._log("shell.run completed: exit_code=%s", returncode)
+        
+        return ToolResult(
+            success=returncode == 0,
+            output={
+                "command": cmd_str,
+                "exit_code": returncode,
+                "stdout": stdout,
+                "stderr": ""
+            },
+            error=stdout if returncode != 0 else None,
+            logs=self._logs.since(mark)
+        )
+    
+    def _read_batch_output(self, proc: subprocess.Popen,
+                           timeout: float) -> Tuple[int, bytes]:
+        """
+        Read a worker's output up to its completion marker.
+        
+        Like run(), at most MAX_OUTPUT_LENGTH bytes of output are kept
+        while reading; the rest is only scanned for the marker.
+        
+        Returns:
+            Tuple of (exit code, output preceding the marker). The output is
+            one byte longer than MAX_OUTPUT_LENGTH when it was truncated.
+            
+        Raises:
+            subprocess.TimeoutExpired: If no marker arrives in time
+            ValueError: If the worker exits before reporting
+        """
+        deadline = time.monotonic() + timeout
+        fd = proc.stdout.fileno()
+        output = bytearray()
+        # Unscanned tail that may still hold the start of the marker, plus
+        # the newline the harness writes before it
+        pending = bytearray()
+        hold = len(_BATCH_MARKER) + 1
+        
+        def keep(data: bytes) -> None:
+            room = MAX_OUTPUT_LENGTH + 1 - len(output)
+            if room > 0:
+                output.extend(data[:room])
+        
+        with _PipeSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while True:
+                idx = pending.find(_BATCH_MARKER)
+                if idx != -1:
+                    start = idx + len(_BATCH_MARKER)
+                    end = pending.find(b"===", start, start + 16)
+                    if end != -1 and pending[start:end].lstrip(b"-").isdigit():
+                        returncode = int(pending[start:end])
+                        # Drop the newline the harness writes before the marker
+                        keep(pending[:max(idx - 1, 0)])
+                        return returncode, bytes(output)
+                    if end != -1 or len(pending) - start >= 16:
+                        # Not followed by an exit code: the marker text was
+                        # part of the test output
+                        keep(pending[:idx + 1])
+                        del pending[:idx + 1]
+                        continue
+                elif len(pending) > hold:
+                    keep(pending[:-hold])
+                    del pending[:-hold]
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(proc.args, timeout)
+                if selector.select(remaining):
+                    data = os.read(fd, READ_CHUNK_SIZE)
+                    if not data:
+                        raise ValueError("test runner exited unexpectedly")
+                    pending += data
+    
+    def _stop_batch_runner(self, framework: str) -> None:
+        """Terminate and forget the pooled worker for `framework`."""
+        proc = self._batch_runners.pop(framework, None)
+        if proc is None:
+            return
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        for pipe in (proc.stdin, proc.stdout):
+            if pipe:
+                pipe.close()
+    
+    def close(self) -> None:
+        """Stop all persistent test runners."""
+        for framework in list(self._batch_runners):
+            self._stop_batch_runner(framework)
+    
     def _parse_test_output(self, output: str, framework: str) -> Dict[str, Any]:
         """Parse test output to extract counts."""
         counts = {"total": 0, "passed": 0, "failed": 0, "skipped": 0}
         
         if framework == "pytest":
             # pytest output: "5 passed, 2 failed, 1 skipped"
-            match = re.search(r'(\d+) passed', output)
-            if match:
-                counts["passed"] = int(match.group(1))
-            match = re.search(r'(\d+) failed', output)
-            if match:
-                counts["failed"] = int(match.group(1))
-            match = re.search(r'(\d+) skipped', output)
-            if match:
-                counts["skipped"] = int(match.group(1))
-            counts["total"] = counts["passed"] + counts["failed"] + counts["skipped"]
-        
+            pattern = _PYTEST_COUNTS_RE
         elif framework == "npm" or framework == "playwright":
             # Jest/Mocha/Playwright: "Tests: X passed, Y failed"
-            match = re.search(r'(\d+) passed', output, re.IGNORECASE)
-            if match:
-                counts["passed"] = int(match.group(1))
-            match = re.search(r'(\d+) failed', output, re.IGNORECASE)
-            if match:
-                counts["failed"] = int(match.group(1))
-            counts["total"] = counts["passed"] + counts["failed"]
+            pattern = _JS_COUNTS_RE
+        else:
+            return counts
+        
+        # The summary is printed last, so try the tail before the whole output
+        found = self._scan_counts(pattern, output[-SUMMARY_TAIL_SIZE:])
+        if not found and len(output) > SUMMARY_TAIL_SIZE:
+            found = self._scan_counts(pattern, output)
+        counts.update(found)
+        counts["total"] = counts["passed"] + counts["failed"] + counts["skipped"]
         
         return counts
     
+    @staticmethod
+    def _scan_counts(pattern: "re.Pattern", text: str) -> Dict[str, int]:
+        """Collect the first count for each outcome in a single pass."""
+        found: Dict[str, int] = {}
+        for match in pattern.finditer(text):
+            key = match.lastgroup
+            if key not in found:
+                found[key] = int(match.group(key))
+        return found
+    
+    @staticmethod
+    def clear_which_cache() -> None:
+        """Forget memoized command lookups (e.g. after installing a tool)."""
+        _which_cached.cache_clear()
+    
+    def refresh_env(self) -> None:
+        """Re-read os.environ into the base environment used for commands."""
+        self._base_env = MappingProxyType(os.environ.copy())
+    
     def get_command_history(self) -> List[Dict[str, Any]]:
-        """Get history of executed commands."""
-        return self._command_history.copy()
+        """Get history of the most recent executed commands (up to history_capacity)."""
+        return [record._asdict() for record in self._command_history]
     
-    def get_logs(self) -> List[str]:
-        """Get all logged operations."""
-        return self._logs.copy()
+    def get_logs(self) -> Tuple[str, ...]:
+        """Get the most recent logged operations (up to LOG_RING_SIZE) as an immutable tuple."""
+        return self._logs.snapshot()
     
     def clear_logs(self) -> None:
         """Clear operation logs."""
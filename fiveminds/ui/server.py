@@ -2,19 +2,228 @@
 Five Minds UI Server - Flask-based web server with WebSocket support
 """
 
-import json
+import gzip
+import hashlib
 import logging
+import os
+import queue
+import secrets
 import threading
 import time
-from datetime import datetime
+from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 
 from flask import Flask, render_template, jsonify, request
-from flask_socketio import SocketIO, emit
+from flask.json.provider import DefaultJSONProvider
+from flask_socketio import SocketIO, emit, join_room
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+try:
+    import orjson  # optional, faster JSON for API responses and socket frames
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Runner log lines are buffered and sent as one batch per runner at this
+# interval (seconds), or sooner once this many lines are waiting. Cost
+# increments are summed and applied at the same interval.
+LOG_FLUSH_INTERVAL = 0.1
+LOG_FLUSH_MAX_LINES = 500
+
+# Socket.IO events are queued and sent together as "batch" events at this
+# interval (seconds), at most this many per batch
+EMIT_FLUSH_INTERVAL = 0.02
+EMIT_BATCH_MAX = 128
+
+# Events that carry a full snapshot: when several are queued together only
+# the newest is sent. status_update is not one of them because the client
+# reacts to every status transition.
+LATEST_ONLY_EVENTS = frozenset({
+    "cost_update",
+    "active_jobs_update",
+    "tickets_update",
+    "dependencies_update",
+})
+
+# Most recent entries kept in the state's append-only histories; older
+# entries are dropped so state size (and every /api/state body) stays bounded
+PROGRESS_LIMIT = 500
+REASONING_LOG_LIMIT = 1000
+RUNNER_LOG_LIMIT = 2000
+
+# Cached JSON bodies at least this large are also served gzip-compressed
+# (compressed once per change) to clients that accept it
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 4
+
+# Room for clients that did not say which view they show; they get every event
+ALL_EVENTS_ROOM = "all"
+
+# Cache key for the serialized whole state in UIServer._json_cache
+STATE_CACHE_KEY = "__state__"
+
+# Cache key for the serialized /api/settings view (no API keys in it)
+SAFE_SETTINGS_CACHE_KEY = "__safe_settings__"
+
+# Rendered view pages kept by UIServer._render_page (one per request path)
+PAGE_CACHE_SIZE = 256
+
+# Browser cache lifetime (seconds) for static files requested with a content
+# version, which changes whenever the file does
+STATIC_MAX_AGE = 365 * 24 * 3600
+
+# Non-string dict keys are accepted by the json module, so accept them too
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+# Wraps already-serialized JSON so orjson embeds it as is (orjson >= 3.9)
+_OrjsonFragment = getattr(orjson, "Fragment", None)
+
+
+# (whole second, its local "YYYY-MM-DDTHH:MM:SS" text) for _iso_timestamp
+_second_prefix = (None, "")
+
+
+def _iso_timestamp(t: Optional[float] = None) -> str:
+    """
+    Format a time.time() value like datetime.fromtimestamp(t).isoformat().
+    
+    The date and time-of-day part is formatted once per second and reused,
+    so stamping a burst of entries only formats the microseconds.
+    
+    Args:
+        t: Seconds since the epoch (default: now)
+        
+    Returns:
+        Local naive ISO 8601 timestamp
+    """
+    global _second_prefix
+    if t is None:
+        t = time.time()
+    second = int(t)
+    # Round the fraction the way datetime.fromtimestamp does
+    micro = round((t - second) * 1_000_000)
+    if micro >= 1_000_000:
+        second += 1
+        micro -= 1_000_000
+    cached_second, prefix = _second_prefix
+    if cached_second != second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+        _second_prefix = (second, prefix)
+    return f"{prefix}.{micro:06d}" if micro else prefix
+
+
+def _trim(items: List[Any], limit: int):
+    """Drop the oldest entries of a list in place so at most `limit` remain."""
+    excess = len(items) - limit
+    if excess > 0:
+        del items[:excess]
+
+
+class _LockSide:
+    """One side (read or write) of an RWLock, usable as a context manager."""
+    
+    def __init__(self, acquire: Callable[[], None], release: Callable[[], None]):
+        self.acquire = acquire
+        self.release = release
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class RWLock:
+    """
+    Reader-writer lock: any number of readers, or one writer.
+    
+    Writers are preferred: once a writer is waiting, new readers block
+    until it is done, so a steady stream of polls cannot starve updates.
+    Not reentrant on either side.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+        self.reader = _LockSide(self.acquire_read, self.release_read)
+        self.writer = _LockSide(self.acquire_write, self.release_write)
+    
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+    
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+    
+    def acquire_write(self):
+        with self._cond:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+    
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    
+    Output is always compact with keys in insertion order. Types orjson
+    does not handle natively go through Flask's default hook.
+    """
+    
+    sort_keys = False
+    compact = True
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=_ORJSON_OPTIONS).decode("utf-8")
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=_ORJSON_OPTIONS),
+            mimetype=self.mimetype
+        )
+
+
+class _OrjsonCodec:
+    """Stand-in for the json module in python-socketio packet encoding."""
+    
+    @staticmethod
+    def dumps(obj: Any, *args: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+    
+    @staticmethod
+    def loads(s: Any, *args: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    """Werkzeug request handler that does not log every request."""
+    
+    def log_request(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
 
 class UIServer:
     """
@@ -27,13 +236,29 @@ class UIServer:
     - Review View: diff viewer, acceptance checklist, risk list, follow-up ticket buttons
     """
 
-    def __init__(self, host: str = "127.0.0.1", port: int = 5000):
+    def __init__(self, host: str = "127.0.0.1", port: int = 5000,
+                 async_mode: Optional[str] = None,
+                 message_queue: Optional[str] = None):
         """
         Initialize the UI server.
 
         Args:
             host: Host address to bind to
             port: Port number to bind to
+            async_mode: SocketIO async mode. Defaults to the
+                FIVEMINDS_UI_ASYNC_MODE environment variable, then
+                'threading'. 'eventlet' and 'gevent' need the host process
+                to monkey-patch the standard library before anything else
+                is imported.
+            message_queue: Message queue URL (e.g. redis://localhost:6379/0)
+                through which Socket.IO events are relayed. State is not
+                shared: exactly one process (the one running Five Minds)
+                owns it, and other processes only relay its events to
+                their sockets, while their own /api routes and connect
+                snapshots show an empty state. Defaults to the
+                FIVEMINDS_UI_MESSAGE_QUEUE environment variable; unset
+                keeps emits in-process. Needs the client library for the
+                queue (e.g. redis) installed.
         """
         self.host = host
         self.port = port
@@ -43,10 +268,27 @@ class UIServer:
             static_folder=str(Path(__file__).parent / "static")
         )
         # Use environment variable for secret key, fallback to generated key
-        import os
-        import secrets
         self.app.config['SECRET_KEY'] = os.environ.get('FIVEMINDS_SECRET_KEY', secrets.token_hex(32))
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*", async_mode='threading')
+        socketio_options: Dict[str, Any] = {
+            "cors_allowed_origins": "*",
+            "async_mode": async_mode or os.environ.get('FIVEMINDS_UI_ASYNC_MODE', 'threading')
+        }
+        message_queue = message_queue or os.environ.get('FIVEMINDS_UI_MESSAGE_QUEUE')
+        if message_queue:
+            socketio_options["message_queue"] = message_queue
+        if orjson is not None:
+            self.app.json = OrjsonProvider(self.app)
+            socketio_options["json"] = _OrjsonCodec
+        else:
+            # Nothing reads this JSON by eye: skip key sorting and indentation
+            self.app.json.sort_keys = False
+            self.app.json.compact = True
+        self.socketio = SocketIO(self.app, **socketio_options)
+        self._async_mode = socketio_options["async_mode"]
+        # state_update payloads can reuse the cached state JSON when the
+        # socket codec is orjson; with a message queue, payloads are also
+        # pickled, so they stay plain dicts
+        self._state_fragments = _OrjsonFragment is not None and not message_queue
         
         # State management
         self._state: Dict[str, Any] = {
@@ -67,9 +309,48 @@ class UIServer:
             "reviews": [],
             "results": {}
         }
-        self._lock = threading.Lock()
+        # Reads (API polls, socket state pushes) share the lock; mutators exclude
+        self._rwlock = RWLock()
+        self._read_lock = self._rwlock.reader
+        self._write_lock = self._rwlock.writer
+        # Serialized JSON per top-level state key, dropped by _invalidate()
+        self._json_cache: Dict[str, bytes] = {}
+        # gzip-compressed copies of large _json_cache entries
+        self._gzip_cache: Dict[str, bytes] = {}
+        # Change counters per cache key, used as ETags; the random prefix keeps
+        # a restarted server from matching ETags a browser cached earlier
+        self._versions: Dict[str, int] = {}
+        self._etag_prefix = secrets.token_hex(4)
+        # Request path -> rendered view HTML; pages only vary by path
+        self._page_cache: Dict[str, str] = {}
+        self._page_cache_lock = threading.Lock()
+        # Static file name -> content hash added to its URLs
+        self._static_versions: Dict[str, str] = {}
+        # Ticket id -> ticket dict in _state["tickets"]
+        self._ticket_index: Dict[str, Dict[str, Any]] = {}
+        # Runner id -> job; _state["active_jobs"] is rebuilt from it on change
+        self._active_jobs: Dict[str, Dict[str, Any]] = {}
+        # Runner log lines not yet applied to the state: runner_id -> [(time, message)]
+        self._log_buffer: Dict[str, List[tuple]] = defaultdict(list)
+        self._log_buffer_size = 0
+        self._log_buffer_lock = threading.Lock()
+        # Serializes flushes so batches for a runner are emitted in order
+        self._flush_lock = threading.Lock()
+        # Cost increments not yet applied to the state: [tokens, api_calls, cost]
+        self._pending_cost: List[Any] = [0, 0, 0.0]
+        self._pending_cost_lock = threading.Lock()
+        # Background task flushing buffered logs and cost
+        self._flusher: Optional[Any] = None
+        # Events waiting for the emit flusher: (event, data, rooms or None)
+        self._emit_queue: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        # Serializes emit flushes so events go out in the order queued
+        self._emit_flush_lock = threading.Lock()
+        self._emit_flusher: Optional[Any] = None
+        self._stopped = False
         self._cancel_callbacks: Dict[str, Callable] = {}
-        self._server_thread: Optional[threading.Thread] = None
+        self._server_thread: Optional[Any] = None
+        # Werkzeug server in threading mode, kept so stop() can shut it down
+        self._wsgi_server: Optional[Any] = None
         self._running = False
         
         self._setup_routes()
@@ -78,216 +359,314 @@ class UIServer:
         logger.info(f"UI Server initialized at {host}:{port}")
 
     def _setup_routes(self):
-        """Setup Flask routes."""
-        
-        @self.app.route('/')
-        def dashboard():
-            """Main dashboard view."""
-            return render_template('dashboard.html')
-        
-        @self.app.route('/runner')
-        def runner_view():
-            """Runner view."""
-            return render_template('runner.html')
-        
-        @self.app.route('/runner/<runner_id>')
-        def runner_detail(runner_id):
-            """Runner detail view."""
-            return render_template('runner_detail.html', runner_id=runner_id)
-        
-        @self.app.route('/headmaster')
-        def headmaster_view():
-            """HeadMaster view."""
-            return render_template('headmaster.html')
-        
-        @self.app.route('/review')
-        def review_view():
-            """Review view."""
-            return render_template('review.html')
-        
-        @self.app.route('/review/<ticket_id>')
-        def review_detail(ticket_id):
-            """Review detail view."""
-            return render_template('review_detail.html', ticket_id=ticket_id)
-        
-        @self.app.route('/settings')
-        def settings_view():
-            """Settings view for API keys and model configuration."""
-            return render_template('settings.html')
+        """Setup Flask routes (views are methods; endpoint names match the old closures)."""
+        self.app.add_url_rule('/', 'dashboard', self._dashboard)
+        self.app.add_url_rule('/runner', 'runner_view', self._runner_view)
+        self.app.add_url_rule('/runner/<runner_id>', 'runner_detail', self._runner_detail)
+        self.app.add_url_rule('/headmaster', 'headmaster_view', self._headmaster_view)
+        self.app.add_url_rule('/review', 'review_view', self._review_view)
+        self.app.add_url_rule('/review/<ticket_id>', 'review_detail', self._review_detail)
+        self.app.add_url_rule('/settings', 'settings_view', self._settings_view)
+        
+        # Versioned static URLs, cached by browsers until the file changes
+        self.app.url_defaults(self._static_url_defaults)
+        self.app.after_request(self._cache_static)
         
         # API endpoints
-        @self.app.route('/api/state')
-        def get_state():
-            """Get current system state."""
-            with self._lock:
-                return jsonify(self._state)
-        
-        @self.app.route('/api/tickets')
-        def get_tickets():
-            """Get all tickets."""
-            with self._lock:
-                return jsonify(self._state["tickets"])
-        
-        @self.app.route('/api/runners')
-        def get_runners():
-            """Get all runners."""
-            with self._lock:
-                return jsonify(self._state["runners"])
-        
-        @self.app.route('/api/reviews')
-        def get_reviews():
-            """Get all reviews."""
-            with self._lock:
-                return jsonify(self._state["reviews"])
-        
-        @self.app.route('/api/headmaster')
-        def get_headmaster():
-            """Get headmaster state."""
-            with self._lock:
-                return jsonify(self._state["headmaster"])
-        
-        @self.app.route('/api/settings', methods=['GET'])
-        def get_settings():
-            """Get current settings (without exposing full API keys)."""
-            with self._lock:
-                settings = self._state.get("settings", {})
-                # Return safe version without full API keys
-                safe_settings = {
-                    "api_keys": {
-                        "openai_configured": bool(settings.get("api_keys", {}).get("openai_key")),
-                        "anthropic_configured": bool(settings.get("api_keys", {}).get("anthropic_key")),
-                        "google_configured": bool(settings.get("api_keys", {}).get("google_key")),
-                        "cohere_configured": bool(settings.get("api_keys", {}).get("cohere_key")),
-                        "custom_endpoint": settings.get("api_keys", {}).get("custom_endpoint", "")
-                    },
-                    "models": settings.get("models", {
-                        "headmaster": "gpt-4",
-                        "runner": "gpt-4",
-                        "reviewer": "gpt-4",
-                        "temperature": 0.7,
-                        "max_tokens": 4096
-                    })
-                }
-                return jsonify(safe_settings)
-        
-        @self.app.route('/api/settings', methods=['POST'])
-        def save_settings():
-            """Save settings."""
-            data = request.json
-            if not data:
-                return jsonify({"success": False, "message": "No data provided"}), 400
+        self.app.add_url_rule('/api/state', 'get_state', self._get_state)
+        self.app.add_url_rule('/api/tickets', 'get_tickets', self._get_tickets)
+        self.app.add_url_rule('/api/runners', 'get_runners', self._get_runners)
+        self.app.add_url_rule('/api/reviews', 'get_reviews', self._get_reviews)
+        self.app.add_url_rule('/api/headmaster', 'get_headmaster', self._get_headmaster)
+        self.app.add_url_rule('/api/settings', 'get_settings', self._get_settings, methods=['GET'])
+        self.app.add_url_rule('/api/settings', 'save_settings', self._save_settings, methods=['POST'])
+        self.app.add_url_rule('/api/settings/reset', 'reset_settings', self._reset_settings, methods=['POST'])
+        self.app.add_url_rule('/api/cancel/<runner_id>', 'cancel_runner', self._cancel_runner, methods=['POST'])
+        self.app.add_url_rule('/api/follow-up', 'create_follow_up', self._create_follow_up, methods=['POST'])
+        self.app.add_url_rule('/api/objective', 'submit_objective', self._submit_objective, methods=['POST'])
+
+    def _static_url_defaults(self, endpoint: str, values: Dict[str, Any]):
+        """Add ?v=<content hash> to url_for('static', ...) URLs."""
+        if endpoint == 'static' and 'filename' in values and 'v' not in values:
+            version = self._static_version(values['filename'])
+            if version:
+                values['v'] = version
+
+    def _static_version(self, filename: str) -> str:
+        """
+        Get the content hash used to version a static file's URL.
+        
+        Args:
+            filename: Path relative to the static folder
             
-            with self._lock:
-                if "settings" not in self._state:
-                    self._state["settings"] = {}
-                
-                # Update API keys (only if provided - don't overwrite with empty)
-                if "api_keys" in data:
-                    if "api_keys" not in self._state["settings"]:
-                        self._state["settings"]["api_keys"] = {}
-                    
-                    for key in ["openai_key", "anthropic_key", "google_key", "cohere_key"]:
-                        if data["api_keys"].get(key):
-                            self._state["settings"]["api_keys"][key] = data["api_keys"][key]
-                    
-                    # Custom endpoint can be empty
-                    if "custom_endpoint" in data["api_keys"]:
-                        self._state["settings"]["api_keys"]["custom_endpoint"] = data["api_keys"]["custom_endpoint"]
-                
-                # Update model configuration
-                if "models" in data:
-                    self._state["settings"]["models"] = data["models"]
+        Returns:
+            Short hex digest, or an empty string if the file can't be read
+        """
+        version = self._static_versions.get(filename)
+        if version is None:
+            try:
+                data = (Path(self.app.static_folder) / filename).read_bytes()
+                version = hashlib.sha1(data).hexdigest()[:12]
+            except OSError:
+                version = ""
+            self._static_versions[filename] = version
+        return version
+
+    def _cache_static(self, response):
+        """Let browsers keep versioned static files without revalidating."""
+        if (request.endpoint == 'static' and request.args.get('v')
+                and response.status_code in (200, 304)):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_MAX_AGE
+            response.cache_control.immutable = True
+        return response
+
+    def _render_page(self, template: str, **context: Any) -> str:
+        """
+        Render a view template, reusing the HTML from the first render.
+        
+        The templates only depend on the request path (navigation state and
+        the id of detail pages), so the page is cached per path. The cache
+        is bounded because detail paths carry arbitrary ids.
+        
+        Args:
+            template: Template file name
+            **context: Template variables, derived from the path
             
-            self._emit_update("settings_update", {"updated": True})
-            return jsonify({"success": True, "message": "Settings saved successfully"})
-        
-        @self.app.route('/api/settings/reset', methods=['POST'])
-        def reset_settings():
-            """Reset settings to defaults."""
-            with self._lock:
-                self._state["settings"] = {
-                    "api_keys": {},
-                    "models": {
-                        "headmaster": "gpt-4",
-                        "runner": "gpt-4",
-                        "reviewer": "gpt-4",
-                        "temperature": 0.7,
-                        "max_tokens": 4096
-                    }
+        Returns:
+            Rendered HTML
+        """
+        path = request.path
+        html = self._page_cache.get(path)
+        if html is None:
+            # Rendered outside the lock; concurrent first requests for a
+            # path may both render, and the later one is stored
+            html = render_template(template, **context)
+            with self._page_cache_lock:
+                if path not in self._page_cache and len(self._page_cache) >= PAGE_CACHE_SIZE:
+                    del self._page_cache[next(iter(self._page_cache))]
+                self._page_cache[path] = html
+        return html
+
+    # Views
+    def _dashboard(self):
+        """Main dashboard view."""
+        return self._render_page('dashboard.html')
+
+    def _runner_view(self):
+        """Runner view."""
+        return self._render_page('runner.html')
+
+    def _runner_detail(self, runner_id):
+        """Runner detail view."""
+        return self._render_page('runner_detail.html', runner_id=runner_id)
+
+    def _headmaster_view(self):
+        """HeadMaster view."""
+        return self._render_page('headmaster.html')
+
+    def _review_view(self):
+        """Review view."""
+        return self._render_page('review.html')
+
+    def _review_detail(self, ticket_id):
+        """Review detail view."""
+        return self._render_page('review_detail.html', ticket_id=ticket_id)
+
+    def _settings_view(self):
+        """Settings view for API keys and model configuration."""
+        return self._render_page('settings.html')
+
+    # API endpoints
+    def _get_state(self):
+        """Get current system state."""
+        return self._cached_response(STATE_CACHE_KEY)
+
+    def _get_tickets(self):
+        """Get all tickets."""
+        return self._cached_response("tickets")
+
+    def _get_runners(self):
+        """Get all runners."""
+        return self._cached_response("runners")
+
+    def _get_reviews(self):
+        """Get all reviews."""
+        return self._cached_response("reviews")
+
+    def _get_headmaster(self):
+        """Get headmaster state."""
+        return self._cached_response("headmaster")
+
+    def _get_settings(self):
+        """Get current settings (without exposing full API keys)."""
+        return self._cached_response(SAFE_SETTINGS_CACHE_KEY)
+
+    def _safe_settings(self) -> Dict[str, Any]:
+        """
+        Build the settings view served by /api/settings (internal, must hold a lock).
+        
+        Returns:
+            Settings with API keys replaced by "configured" flags
+        """
+        settings = self._state.get("settings", {})
+        # Return safe version without full API keys
+        return {
+            "api_keys": {
+                "openai_configured": bool(settings.get("api_keys", {}).get("openai_key")),
+                "anthropic_configured": bool(settings.get("api_keys", {}).get("anthropic_key")),
+                "google_configured": bool(settings.get("api_keys", {}).get("google_key")),
+                "cohere_configured": bool(settings.get("api_keys", {}).get("cohere_key")),
+                "custom_endpoint": settings.get("api_keys", {}).get("custom_endpoint", "")
+            },
+            "models": settings.get("models", {
+                "headmaster": "gpt-4",
+                "runner": "gpt-4",
+                "reviewer": "gpt-4",
+                "temperature": 0.7,
+                "max_tokens": 4096
+            })
+        }
+
+    def _save_settings(self):
+        """Save settings."""
+        data = request.get_json(silent=True, cache=False)
+        if not data:
+            return jsonify({"success": False, "message": "No data provided"}), 400
+        
+        with self._write_lock:
+            if "settings" not in self._state:
+                self._state["settings"] = {}
+        
+            # Update API keys (only if provided - don't overwrite with empty)
+            if "api_keys" in data:
+                if "api_keys" not in self._state["settings"]:
+                    self._state["settings"]["api_keys"] = {}
+        
+                for key in ["openai_key", "anthropic_key", "google_key", "cohere_key"]:
+                    if data["api_keys"].get(key):
+                        self._state["settings"]["api_keys"][key] = data["api_keys"][key]
+        
+                # Custom endpoint can be empty
+                if "custom_endpoint" in data["api_keys"]:
+                    self._state["settings"]["api_keys"]["custom_endpoint"] = data["api_keys"]["custom_endpoint"]
+        
+            # Update model configuration
+            if "models" in data:
+                self._state["settings"]["models"] = data["models"]
+            self._invalidate("settings", SAFE_SETTINGS_CACHE_KEY)
+        
+        self._emit_update("settings_update", {"updated": True})
+        return jsonify({"success": True, "message": "Settings saved successfully"})
+
+    def _reset_settings(self):
+        """Reset settings to defaults."""
+        with self._write_lock:
+            self._state["settings"] = {
+                "api_keys": {},
+                "models": {
+                    "headmaster": "gpt-4",
+                    "runner": "gpt-4",
+                    "reviewer": "gpt-4",
+                    "temperature": 0.7,
+                    "max_tokens": 4096
                 }
-            
-            self._emit_update("settings_update", {"reset": True})
-            return jsonify({"success": True, "message": "Settings reset to defaults"})
-        
-        @self.app.route('/api/cancel/<runner_id>', methods=['POST'])
-        def cancel_runner(runner_id):
-            """Cancel a runner."""
-            callback = self._cancel_callbacks.get(runner_id)
-            if callback:
-                try:
-                    callback()
-                    return jsonify({"success": True, "message": f"Runner {runner_id} cancelled"})
-                except Exception as e:
-                    return jsonify({"success": False, "message": str(e)}), 500
-            return jsonify({"success": False, "message": f"Runner {runner_id} not found"}), 404
-        
-        @self.app.route('/api/follow-up', methods=['POST'])
-        def create_follow_up():
-            """Create a follow-up ticket."""
-            data = request.json
-            if not data:
-                return jsonify({"success": False, "message": "No data provided"}), 400
-            
-            # Add to tickets list
-            with self._lock:
-                self._state["tickets"].append(data)
-            
-            self._emit_update("tickets_update", self._state["tickets"])
-            return jsonify({"success": True, "message": "Follow-up ticket created"})
-        
-        @self.app.route('/api/objective', methods=['POST'])
-        def submit_objective():
-            """Submit a new objective."""
-            data = request.json
-            if not data:
-                return jsonify({"success": False, "message": "No data provided"}), 400
-            
-            # Validate objective data
-            if not data.get("description"):
-                return jsonify({"success": False, "message": "Objective description is required"}), 400
-            
-            # Store objective
-            objective = {
-                "description": data.get("description", ""),
-                "requirements": data.get("requirements", []),
-                "constraints": data.get("constraints", []),
-                "success_metrics": data.get("success_metrics", ["All acceptance criteria met", "All tests pass"])
             }
-            
-            # Update state
-            with self._lock:
-                self._state["objective"] = objective
-                self._state["status"] = "analyzing"
-                self._state["start_time"] = datetime.now().isoformat()
-                self._add_progress("New objective submitted: " + objective["description"])
-            
-            # Emit updates
-            self._emit_update("objective_update", self._state["objective"])
-            self._emit_update("status_update", self._state["status"])
-            
-            logger.info(f"New objective submitted: {objective['description']}")
-            
-            return jsonify({"success": True, "message": "Objective submitted successfully"})
+            self._invalidate("settings", SAFE_SETTINGS_CACHE_KEY)
+        
+        self._emit_update("settings_update", {"reset": True})
+        return jsonify({"success": True, "message": "Settings reset to defaults"})
+
+    def _cancel_runner(self, runner_id):
+        """Cancel a runner."""
+        callback = self._cancel_callbacks.get(runner_id)
+        if callback:
+            try:
+                callback()
+                return jsonify({"success": True, "message": f"Runner {runner_id} cancelled"})
+            except Exception as e:
+                return jsonify({"success": False, "message": str(e)}), 500
+        return jsonify({"success": False, "message": f"Runner {runner_id} not found"}), 404
+
+    def _create_follow_up(self):
+        """Create a follow-up ticket."""
+        data = request.get_json(silent=True, cache=False)
+        if not data:
+            return jsonify({"success": False, "message": "No data provided"}), 400
+        
+        # Add to tickets list
+        with self._write_lock:
+            self._state["tickets"].append(data)
+            self._index_tickets([data])
+            self._invalidate("tickets")
+        
+        # Clients append it to their copy of the list; update_ticket
+        # changes the stored dict, so queue a copy
+        self._emit_update("ticket_added", dict(data))
+        return jsonify({"success": True, "message": "Follow-up ticket created"})
+
+    def _submit_objective(self):
+        """Submit a new objective."""
+        data = request.get_json(silent=True, cache=False)
+        if not data:
+            return jsonify({"success": False, "message": "No data provided"}), 400
+        
+        # Validate objective data
+        if not isinstance(data, dict) or not data.get("description"):
+            return jsonify({"success": False, "message": "Objective description is required"}), 400
+        
+        # Store objective
+        objective = {
+            "description": data.get("description", ""),
+            "requirements": data.get("requirements", []),
+            "constraints": data.get("constraints", []),
+            "success_metrics": data.get("success_metrics", ["All acceptance criteria met", "All tests pass"])
+        }
+        
+        # Update state
+        with self._write_lock:
+            self._state["objective"] = objective
+            self._state["status"] = "analyzing"
+            self._state["start_time"] = _iso_timestamp()
+            self._invalidate("objective", "status", "start_time")
+            progress = self._add_progress("New objective submitted: " + objective["description"])
+        
+        # Emit updates
+        self._emit_many([
+            ("progress_update", progress),
+            ("objective_update", objective),
+            ("status_update", "analyzing")
+        ])
+        
+        logger.info(f"New objective submitted: {objective['description']}")
+        
+        return jsonify({"success": True, "message": "Objective submitted successfully"})
 
     def _setup_socketio_handlers(self):
         """Setup WebSocket handlers."""
         
         @self.socketio.on('connect')
-        def handle_connect():
-            """Handle client connection."""
+        def handle_connect(auth=None):
+            """
+            Handle client connection.
+            
+            Clients pass {"view": ..., "runner_id": ...} as connect auth and
+            join the matching room, so high-volume events only reach the
+            views that show them.
+            """
             logger.info("Client connected to UI")
-            with self._lock:
-                emit('state_update', self._state)
+            view = auth.get("view") if isinstance(auth, dict) else None
+            if not view:
+                join_room(ALL_EVENTS_ROOM)
+            elif view == "runner" and auth.get("runner_id"):
+                join_room(f"runner:{auth['runner_id']}")
+            else:
+                join_room(f"view:{view}")
+            # Send queued events first, so none the snapshot already
+            # includes reaches the client after it
+            self.flush_emits()
+            emit('state_update', self._state_message())
         
         @self.socketio.on('disconnect')
         def handle_disconnect():
@@ -295,20 +674,283 @@ class UIServer:
             logger.info("Client disconnected from UI")
         
         @self.socketio.on('request_state')
-        def handle_request_state():
-            """Handle state request from client."""
-            with self._lock:
-                emit('state_update', self._state)
+        def handle_request_state(data=None):
+            """
+            Handle state request from client.
+            
+            A client that passes {"version": state.state_version} only gets
+            a state_update if the state changed since that version.
+            """
+            version = data.get("version") if isinstance(data, dict) else None
+            self.flush_emits()
+            state = self._state_message(version)
+            if state is not None:
+                emit('state_update', state)
+
+    def _invalidate(self, *keys: str):
+        """
+        Drop cached JSON for changed state sections (internal, must hold the write lock).
+        
+        The whole-state entry is always dropped as well, and the version
+        (ETag) of each dropped entry is bumped.
+        
+        Args:
+            keys: Top-level state keys that changed
+        """
+        for key in keys:
+            self._json_cache.pop(key, None)
+            self._gzip_cache.pop(key, None)
+            self._versions[key] = self._versions.get(key, 0) + 1
+        self._json_cache.pop(STATE_CACHE_KEY, None)
+        self._gzip_cache.pop(STATE_CACHE_KEY, None)
+        self._versions[STATE_CACHE_KEY] = self._versions.get(STATE_CACHE_KEY, 0) + 1
+
+    def _cached_json(self, key: str) -> bytes:
+        """
+        Get the serialized JSON for a state section (internal, must hold a lock).
+        
+        Concurrent readers may both fill a missing entry; the results are
+        identical, since writers are excluded while they run.
+        
+        Args:
+            key: Top-level state key, STATE_CACHE_KEY for the whole state or
+                SAFE_SETTINGS_CACHE_KEY for the public settings view
+            
+        Returns:
+            JSON body, serialized at most once per change
+        """
+        body = self._json_cache.get(key)
+        if body is None:
+            if key == STATE_CACHE_KEY:
+                value = self._state
+            elif key == SAFE_SETTINGS_CACHE_KEY:
+                value = self._safe_settings()
+            else:
+                value = self._state[key]
+            body = self._serialize(value)
+            self._json_cache[key] = body
+        return body
+
+    def _state_json(self, version: Optional[str] = None) -> Optional[Tuple[str, bytes]]:
+        """
+        Get the cached serialized state unless the caller already has it.
+        
+        Args:
+            version: State version from an earlier call (the /api/state ETag)
+            
+        Returns:
+            (version, JSON bytes) tuple, or None if the state is still at `version`
+        """
+        with self._read_lock:
+            current = self._etag(STATE_CACHE_KEY)
+            if version == current:
+                return None
+            return current, self._cached_json(STATE_CACHE_KEY)
 
-    def _emit_update(self, event: str, data: Any):
+    def get_state_if_changed(self, version: Optional[str] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
         """
-        Emit an update to all connected clients.
+        Get a copy of the state unless the caller already has it.
+        
+        Args:
+            version: State version from an earlier call (the /api/state ETag)
+            
+        Returns:
+            (version, state) tuple, or None if the state is still at `version`
+        """
+        with self._read_lock:
+            current = self._etag(STATE_CACHE_KEY)
+            if version == current:
+                return None
+            return current, dict(self._state)
+
+    def _state_message(self, version: Optional[str] = None) -> Any:
+        """
+        Build a state_update payload, tagged with its version for later requests.
+        
+        When the socket codec can embed serialized JSON, the cached state
+        bytes are sent without being decoded and encoded again.
+        
+        Args:
+            version: State version the client already has, if any
+            
+        Returns:
+            State with a "state_version" key (a dict, or an orjson Fragment
+            of the same object), or None if unchanged
+        """
+        changed = self._state_json(version)
+        if changed is None:
+            return None
+        current, body = changed
+        if self._state_fragments:
+            # The cached state is a non-empty JSON object: splice the
+            # version in as its first key
+            return _OrjsonFragment(
+                b'{"state_version":' + orjson.dumps(current) + b',' + body[1:]
+            )
+        state = self._deserialize(body)
+        state["state_version"] = current
+        return state
+
+    def _etag(self, key: str) -> str:
+        """Get the current version tag of a cache key (internal, must hold a lock)."""
+        return f"{self._etag_prefix}-{key}-{self._versions.get(key, 0)}"
+
+    def _serialize(self, obj: Any) -> bytes:
+        """Serialize to JSON bytes with the app's JSON settings."""
+        if orjson is not None:
+            return orjson.dumps(obj, default=self.app.json.default, option=_ORJSON_OPTIONS)
+        return self.app.json.dumps(obj).encode("utf-8")
+
+    def _deserialize(self, body: bytes) -> Any:
+        """Decode JSON bytes produced by _serialize()."""
+        if orjson is not None:
+            return orjson.loads(body)
+        return self.app.json.loads(body)
+
+    def _cached_response(self, key: str):
+        """
+        Serve a state section with an ETag, answering 304 if the client has it.
+        
+        The ETag is the section's version, so a matching If-None-Match skips
+        even the cache lookup. Large bodies are gzipped once per change and
+        the compressed copy is reused for every client that accepts gzip.
+        
+        Args:
+            key: Cache key, as for _cached_json()
+            
+        Returns:
+            Flask response
+        """
+        use_gzip = request.accept_encodings["gzip"] > 0
+        with self._read_lock:
+            etag = self._etag(key)
+            # The gzip variant has its own tag; either one means "unchanged"
+            if request.if_none_match.contains(etag + "-gz"):
+                body = None
+            elif request.if_none_match.contains(etag):
+                body = None
+                use_gzip = False
+            else:
+                body = self._cached_json(key)
+                if use_gzip and len(body) >= COMPRESS_MIN_SIZE:
+                    compressed = self._gzip_cache.get(key)
+                    if compressed is None:
+                        compressed = gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0)
+                        self._gzip_cache[key] = compressed
+                    body = compressed
+                else:
+                    use_gzip = False
+        if body is None:
+            response = self.app.response_class(status=304)
+        else:
+            response = self._json_response(body)
+        if use_gzip:
+            if body is not None:
+                response.headers["Content-Encoding"] = "gzip"
+            etag += "-gz"
+        response.headers["Vary"] = "Accept-Encoding"
+        response.set_etag(etag)
+        return response
+
+    def _json_response(self, body: bytes):
+        """Wrap an already serialized JSON body in a response."""
+        return self.app.response_class(body, mimetype="application/json")
+
+    def _emit_update(self, event: str, data: Any, rooms: Optional[List[str]] = None):
+        """
+        Queue an update for connected clients.
+        
+        Queued events are sent every EMIT_FLUSH_INTERVAL seconds, several to
+        a "batch" event, by a background task started on first use.
+        Data is serialized when it is sent, so pass a copy of anything the
+        state keeps changing.
         
         Args:
             event: Event name
             data: Event data
+            rooms: Rooms to send to (clients without a view always get it);
+                broadcast to everyone if None
         """
-        self.socketio.emit(event, data)
+        self._emit_queue.put((event, data, tuple(rooms) if rooms is not None else None))
+        if self._stopped:
+            # Once stopped there is no flusher, so deliver right away
+            self.flush_emits()
+        elif self._emit_flusher is None:
+            with self._emit_flush_lock:
+                if self._emit_flusher is None:
+                    self._emit_flusher = self.socketio.start_background_task(self._flush_emits_loop)
+
+    def _emit_many(self, events: List[Tuple[str, Any]]):
+        """
+        Queue several broadcast updates, in order.
+        
+        Args:
+            events: (event name, data) pairs
+        """
+        for event, data in events:
+            self._emit_update(event, data)
+
+    def _flush_emits_loop(self):
+        """Send queued events periodically (internal, background task)."""
+        while not self._stopped:
+            self.socketio.sleep(EMIT_FLUSH_INTERVAL)
+            self.flush_emits()
+
+    def flush_emits(self):
+        """
+        Send all queued events.
+        
+        Consecutive events for the same rooms go out as one "batch" event
+        holding [event, data] pairs, which the client dispatches in order.
+        Of the LATEST_ONLY_EVENTS queued for the same rooms only the last
+        is sent.
+        """
+        with self._emit_flush_lock:
+            items = []
+            while True:
+                try:
+                    items.append(self._emit_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not items:
+                return
+            
+            last = {}
+            for index, (event, _, rooms) in enumerate(items):
+                if event in LATEST_ONLY_EVENTS:
+                    last[(event, rooms)] = index
+            
+            run: List[list] = []
+            run_rooms = None
+            for index, (event, data, rooms) in enumerate(items):
+                if event in LATEST_ONLY_EVENTS and last[(event, rooms)] != index:
+                    continue
+                if run and (rooms != run_rooms or len(run) >= EMIT_BATCH_MAX):
+                    self._send_events(run, run_rooms)
+                    run = []
+                run_rooms = rooms
+                run.append([event, data])
+            if run:
+                self._send_events(run, run_rooms)
+
+    def _send_events(self, events: List[list], rooms: Optional[tuple]):
+        """
+        Emit [event, data] pairs to rooms (internal, called by flush_emits).
+        
+        A single event is sent as itself rather than wrapped in a batch.
+        
+        Args:
+            events: [event, data] pairs
+            rooms: Rooms to send to, or None to broadcast
+        """
+        if len(events) == 1:
+            event, data = events[0]
+        else:
+            event, data = "batch", events
+        if rooms is None:
+            self.socketio.emit(event, data)
+        else:
+            self.socketio.emit(event, data, to=list(rooms) + [ALL_EVENTS_ROOM])
 
     # State update methods
     def set_objective(self, objective: Dict[str, Any]):
@@ -318,13 +960,17 @@ class UIServer:
         Args:
             objective: Objective data
         """
-        with self._lock:
+        with self._write_lock:
             self._state["objective"] = objective
             self._state["status"] = "analyzing"
-            self._state["start_time"] = datetime.now().isoformat()
-            self._add_progress("Objective set: " + objective.get("description", ""))
-        self._emit_update("objective_update", self._state["objective"])
-        self._emit_update("status_update", self._state["status"])
+            self._state["start_time"] = _iso_timestamp()
+            self._invalidate("objective", "status", "start_time")
+            progress = self._add_progress("Objective set: " + objective.get("description", ""))
+        self._emit_many([
+            ("progress_update", progress),
+            ("objective_update", objective),
+            ("status_update", "analyzing")
+        ])
 
     def set_status(self, status: str):
         """
@@ -333,24 +979,36 @@ class UIServer:
         Args:
             status: Status string
         """
-        with self._lock:
+        with self._write_lock:
             self._state["status"] = status
-            self._add_progress(f"Status changed to: {status}")
-        self._emit_update("status_update", status)
+            self._invalidate("status")
+            progress = self._add_progress(f"Status changed to: {status}")
+        self._emit_many([
+            ("progress_update", progress),
+            ("status_update", status)
+        ])
 
-    def _add_progress(self, message: str):
+    def _add_progress(self, message: str) -> Dict[str, Any]:
         """
-        Add a progress entry (internal, must hold lock).
+        Add a progress entry (internal, must hold the write lock).
+        
+        The caller emits the returned entry as a progress_update event
+        once it has released the lock.
         
         Args:
             message: Progress message
+            
+        Returns:
+            The new progress entry
         """
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_timestamp(),
             "message": message
         }
         self._state["progress"].append(entry)
-        self._emit_update("progress_update", entry)
+        _trim(self._state["progress"], PROGRESS_LIMIT)
+        self._invalidate("progress")
+        return entry
 
     def add_progress(self, message: str):
         """
@@ -359,23 +1017,49 @@ class UIServer:
         Args:
             message: Progress message
         """
-        with self._lock:
-            self._add_progress(message)
+        with self._write_lock:
+            progress = self._add_progress(message)
+        self._emit_update("progress_update", progress)
 
     def update_cost(self, tokens: int = 0, api_calls: int = 0, cost: float = 0.0):
         """
         Update cost usage.
         
+        Increments are summed, then applied to the state and emitted as one
+        cost_update event every LOG_FLUSH_INTERVAL seconds.
+        
         Args:
             tokens: Number of tokens used
             api_calls: Number of API calls made
             cost: Estimated cost in USD
         """
-        with self._lock:
+        with self._pending_cost_lock:
+            pending = self._pending_cost
+            pending[0] += tokens
+            pending[1] += api_calls
+            pending[2] += cost
+        if self._stopped:
+            # Once stopped there is no flusher, so apply right away
+            self.flush_cost()
+        elif self._flusher is None:
+            with self._log_buffer_lock:
+                if self._flusher is None and not self._stopped:
+                    self._flusher = self.socketio.start_background_task(self._flush_loop)
+
+    def flush_cost(self):
+        """Apply summed cost increments to the state and emit the new totals."""
+        with self._pending_cost_lock:
+            tokens, api_calls, cost = self._pending_cost
+            if not (tokens or api_calls or cost):
+                return
+            self._pending_cost = [0, 0, 0.0]
+        with self._write_lock:
             self._state["cost_usage"]["tokens"] += tokens
             self._state["cost_usage"]["api_calls"] += api_calls
             self._state["cost_usage"]["estimated_cost"] += cost
-        self._emit_update("cost_update", self._state["cost_usage"])
+            self._invalidate("cost_usage")
+            cost_usage = dict(self._state["cost_usage"])
+        self._emit_update("cost_update", cost_usage)
 
     def set_tickets(self, tickets: List[Dict[str, Any]]):
         """
@@ -384,10 +1068,34 @@ class UIServer:
         Args:
             tickets: List of ticket data
         """
-        with self._lock:
+        with self._write_lock:
             self._state["tickets"] = tickets
-            self._add_progress(f"Created {len(tickets)} tickets")
-        self._emit_update("tickets_update", tickets)
+            self._ticket_index = {}
+            self._index_tickets(tickets)
+            self._invalidate("tickets")
+            progress = self._add_progress(f"Created {len(tickets)} tickets")
+            # Follow-ups and update_ticket change the stored list and dicts
+            # before the event is sent, so queue copies
+            tickets = [dict(t) if isinstance(t, dict) else t for t in tickets]
+        self._emit_many([
+            ("progress_update", progress),
+            ("tickets_update", tickets)
+        ])
+
+    def _index_tickets(self, tickets: List[Dict[str, Any]]):
+        """
+        Add tickets to the id index (internal, must hold the write lock).
+        
+        The index holds the same dicts as the tickets list, so updating
+        through it updates the list. The first ticket with an id wins.
+        
+        Args:
+            tickets: Tickets to index
+        """
+        for ticket in tickets:
+            ticket_id = ticket.get("id") if isinstance(ticket, dict) else None
+            if ticket_id is not None:
+                self._ticket_index.setdefault(ticket_id, ticket)
 
     def update_ticket(self, ticket_id: str, updates: Dict[str, Any]):
         """
@@ -397,11 +1105,11 @@ class UIServer:
             ticket_id: Ticket ID
             updates: Updates to apply
         """
-        with self._lock:
-            for ticket in self._state["tickets"]:
-                if ticket.get("id") == ticket_id:
-                    ticket.update(updates)
-                    break
+        with self._write_lock:
+            ticket = self._ticket_index.get(ticket_id)
+            if ticket is not None:
+                ticket.update(updates)
+                self._invalidate("tickets")
         self._emit_update("ticket_update", {"id": ticket_id, "updates": updates})
 
     def add_runner(self, runner_id: str, ticket_id: str, cancel_callback: Optional[Callable] = None):
@@ -417,40 +1125,91 @@ class UIServer:
             "id": runner_id,
             "ticket_id": ticket_id,
             "status": "running",
-            "start_time": datetime.now().isoformat(),
+            "start_time": _iso_timestamp(),
             "logs": [],
             "files_touched": [],
             "runtime": 0
         }
-        with self._lock:
+        with self._write_lock:
             self._state["runners"][runner_id] = runner_data
-            self._state["active_jobs"].append({
+            self._active_jobs[runner_id] = {
                 "runner_id": runner_id,
                 "ticket_id": ticket_id,
                 "status": "running"
-            })
+            }
+            # A fresh list each time, so emitting it later needs no copy
+            active_jobs = self._state["active_jobs"] = list(self._active_jobs.values())
+            self._invalidate("runners", "active_jobs")
             if cancel_callback:
                 self._cancel_callbacks[runner_id] = cancel_callback
-            self._add_progress(f"Runner {runner_id} started on ticket {ticket_id}")
-        self._emit_update("runner_update", runner_data)
-        self._emit_update("active_jobs_update", self._state["active_jobs"])
+            progress = self._add_progress(f"Runner {runner_id} started on ticket {ticket_id}")
+        # Log lines and completion change the stored dict before the event
+        # is sent, and go out as their own events, so queue a copy
+        self._emit_many([
+            ("progress_update", progress),
+            ("runner_update", dict(runner_data, logs=[])),
+            ("active_jobs_update", active_jobs)
+        ])
 
     def update_runner_log(self, runner_id: str, log_entry: str):
         """
         Add a log entry to a runner.
         
+        Lines are buffered, then applied to the state and emitted as one
+        runner_log_batch event per runner every LOG_FLUSH_INTERVAL seconds.
+        
         Args:
             runner_id: Runner ID
             log_entry: Log entry to add
         """
-        log_data = {
-            "timestamp": datetime.now().isoformat(),
-            "message": log_entry
-        }
-        with self._lock:
-            if runner_id in self._state["runners"]:
-                self._state["runners"][runner_id]["logs"].append(log_data)
-        self._emit_update("runner_log", {"runner_id": runner_id, "log": log_data})
+        with self._log_buffer_lock:
+            self._log_buffer[runner_id].append((time.time(), log_entry))
+            self._log_buffer_size += 1
+            # Once stopped there is no flusher, so deliver lines right away
+            flush_now = self._stopped or self._log_buffer_size >= LOG_FLUSH_MAX_LINES
+            if self._flusher is None and not self._stopped:
+                self._flusher = self.socketio.start_background_task(self._flush_loop)
+        if flush_now:
+            self.flush_runner_logs()
+
+    def _flush_loop(self):
+        """Flush buffered runner logs and cost periodically (internal, background task)."""
+        while not self._stopped:
+            self.socketio.sleep(LOG_FLUSH_INTERVAL)
+            self.flush_runner_logs()
+            self.flush_cost()
+
+    def flush_runner_logs(self):
+        """
+        Apply buffered runner log lines to the state and emit them.
+        
+        Each runner's pending lines go out as a single runner_log_batch
+        event with {"runner_id": ..., "logs": [...]}.
+        """
+        with self._flush_lock:
+            with self._log_buffer_lock:
+                if not self._log_buffer_size:
+                    return
+                pending, self._log_buffer = self._log_buffer, defaultdict(list)
+                self._log_buffer_size = 0
+            
+            batches = []
+            with self._write_lock:
+                for runner_id, lines in pending.items():
+                    logs = [
+                        {"timestamp": _iso_timestamp(ts), "message": message}
+                        for ts, message in lines
+                    ]
+                    runner = self._state["runners"].get(runner_id)
+                    if runner is not None:
+                        runner["logs"].extend(logs)
+                        _trim(runner["logs"], RUNNER_LOG_LIMIT)
+                    batches.append((runner_id, logs))
+                self._invalidate("runners")
+            
+            for runner_id, logs in batches:
+                self._emit_update("runner_log_batch", {"runner_id": runner_id, "logs": logs},
+                                  rooms=["view:runner", f"runner:{runner_id}"])
 
     def update_runner_files(self, runner_id: str, files: List[str]):
         """
@@ -460,10 +1219,12 @@ class UIServer:
             runner_id: Runner ID
             files: List of file paths
         """
-        with self._lock:
+        with self._write_lock:
             if runner_id in self._state["runners"]:
                 self._state["runners"][runner_id]["files_touched"] = files
-        self._emit_update("runner_files", {"runner_id": runner_id, "files": files})
+                self._invalidate("runners")
+        self._emit_update("runner_files", {"runner_id": runner_id, "files": files},
+                          rooms=[f"runner:{runner_id}"])
 
     def complete_runner(self, runner_id: str, result: Dict[str, Any]):
         """
@@ -473,28 +1234,32 @@ class UIServer:
             runner_id: Runner ID
             result: Runner result data
         """
-        with self._lock:
+        # Deliver the runner's last log lines before it is marked complete
+        self.flush_runner_logs()
+        with self._write_lock:
             if runner_id in self._state["runners"]:
                 self._state["runners"][runner_id]["status"] = "completed"
                 self._state["runners"][runner_id]["result"] = result
-                self._state["runners"][runner_id]["end_time"] = datetime.now().isoformat()
+                self._state["runners"][runner_id]["end_time"] = _iso_timestamp()
             
             # Update active jobs
-            self._state["active_jobs"] = [
-                job for job in self._state["active_jobs"]
-                if job["runner_id"] != runner_id
-            ]
+            self._active_jobs.pop(runner_id, None)
+            active_jobs = self._state["active_jobs"] = list(self._active_jobs.values())
             
             # Store result
             self._state["results"][runner_id] = result
+            self._invalidate("runners", "active_jobs", "results")
             
             # Remove cancel callback
             self._cancel_callbacks.pop(runner_id, None)
             
-            self._add_progress(f"Runner {runner_id} completed")
+            progress = self._add_progress(f"Runner {runner_id} completed")
         
-        self._emit_update("runner_complete", {"runner_id": runner_id, "result": result})
-        self._emit_update("active_jobs_update", self._state["active_jobs"])
+        self._emit_many([
+            ("progress_update", progress),
+            ("runner_complete", {"runner_id": runner_id, "result": result}),
+            ("active_jobs_update", active_jobs)
+        ])
 
     def update_headmaster(self, key: str, value: Any):
         """
@@ -504,8 +1269,9 @@ class UIServer:
             key: State key to update
             value: New value
         """
-        with self._lock:
+        with self._write_lock:
             self._state["headmaster"][key] = value
+            self._invalidate("headmaster")
         self._emit_update("headmaster_update", {key: value})
 
     def add_headmaster_reasoning(self, reasoning: str):
@@ -516,23 +1282,35 @@ class UIServer:
             reasoning: Reasoning message
         """
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_timestamp(),
             "message": reasoning
         }
-        with self._lock:
+        with self._write_lock:
             self._state["headmaster"]["reasoning_log"].append(entry)
-        self._emit_update("headmaster_reasoning", entry)
+            _trim(self._state["headmaster"]["reasoning_log"], REASONING_LOG_LIMIT)
+            self._invalidate("headmaster")
+        self._emit_update("headmaster_reasoning", entry,
+                          rooms=["view:dashboard", "view:headmaster"])
 
     def set_dependencies(self, dependencies: List[Dict[str, Any]]):
         """
         Set dependency data.
         
+        When the new list only extends the previous one, clients are sent
+        the new relationships (dependencies_append) instead of the whole list.
+        
         Args:
             dependencies: List of dependency relationships
         """
-        with self._lock:
+        with self._write_lock:
+            previous = self._state["headmaster"]["dependencies"]
             self._state["headmaster"]["dependencies"] = dependencies
-        self._emit_update("dependencies_update", dependencies)
+            self._invalidate("headmaster")
+        count = len(previous)
+        if 0 < count < len(dependencies) and dependencies[:count] == previous:
+            self._emit_update("dependencies_append", dependencies[count:])
+        else:
+            self._emit_update("dependencies_update", list(dependencies))
 
     def add_review(self, review: Dict[str, Any]):
         """
@@ -541,10 +1319,14 @@ class UIServer:
         Args:
             review: Review data
         """
-        with self._lock:
+        with self._write_lock:
             self._state["reviews"].append(review)
-            self._add_progress(f"Review added for ticket {review.get('ticket_id', 'unknown')}")
-        self._emit_update("review_update", review)
+            self._invalidate("reviews")
+            progress = self._add_progress(f"Review added for ticket {review.get('ticket_id', 'unknown')}")
+        self._emit_many([
+            ("progress_update", progress),
+            ("review_update", review)
+        ])
 
     def get_state(self) -> Dict[str, Any]:
         """
@@ -553,7 +1335,7 @@ class UIServer:
         Returns:
             Current state dictionary
         """
-        with self._lock:
+        with self._read_lock:
             return dict(self._state)
 
     def start(self, background: bool = True):
@@ -565,27 +1347,61 @@ class UIServer:
         """
         if background:
             self._running = True
-            self._server_thread = threading.Thread(
-                target=self._run_server,
-                daemon=True
-            )
-            self._server_thread.start()
+            # A daemon thread in threading mode, a greenlet under eventlet/gevent
+            self._server_thread = self.socketio.start_background_task(self._run_server)
             logger.info(f"UI Server started in background at http://{self.host}:{self.port}")
         else:
             self._run_server()
 
     def _run_server(self):
-        """Run the server (internal)."""
-        self.socketio.run(
-            self.app,
-            host=self.host,
-            port=self.port,
-            debug=False,
-            use_reloader=False,
-            log_output=False
-        )
+        """
+        Run the server (internal).
+        
+        In threading mode the Werkzeug server is created here rather than
+        inside socketio.run(), so stop() has a handle to shut it down.
+        """
+        if self._async_mode != 'threading':
+            self.socketio.run(
+                self.app,
+                host=self.host,
+                port=self.port,
+                debug=False,
+                use_reloader=False,
+                log_output=False
+            )
+            return
+        
+        server = make_server(self.host, self.port, self.app, threaded=True,
+                             request_handler=_QuietRequestHandler)
+        self._wsgi_server = server
+        if self._stopped:
+            server.server_close()
+            return
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
 
-    def stop(self):
-        """Stop the UI server."""
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the UI server.
+        
+        Pending logs, cost and events are flushed first. In threading mode
+        the HTTP server is shut down and its thread joined; under eventlet
+        or gevent the server keeps running until the process exits.
+        
+        Args:
+            timeout: Seconds to wait for the server thread to finish
+        """
         self._running = False
+        self._stopped = True
+        self.flush_runner_logs()
+        self.flush_cost()
+        self.flush_emits()
+        server, self._wsgi_server = self._wsgi_server, None
+        if server is not None:
+            server.shutdown()
+            thread = self._server_thread
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout)
         logger.info("UI Server stopped")
@@ -22,14 +22,15 @@ document.addEventListener('DOMContentLoaded', function() {
 function initializeSocket() {
     const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
     socket = io(window.location.origin, {
-        transports: ['websocket', 'polling']
+        transports: ['websocket', 'polling'],
+        auth: viewSubscription()
     });
 
     socket.on('connect', function() {
         connected = true;
         updateConnectionStatus(true);
         console.log('Connected to Five Minds server');
-        socket.emit('request_state');
+        // The server pushes state_update on every (re)connect by itself
     });
 
     socket.on('disconnect', function() {
@@ -38,6 +39,15 @@ function initializeSocket() {
         console.log('Disconnected from Five Minds server');
     });
 
+    // Several updates sent together as [[event, data], ...]
+    socket.on('batch', function(events) {
+        events.forEach(function(item) {
+            socket.listeners(item[0]).forEach(function(handler) {
+                handler(item[1]);
+            });
+        });
+    });
+
     socket.on('state_update', function(data) {
         state = data;
         if (typeof onStateUpdate === 'function') {
@@ -72,12 +82,33 @@ function initializeSocket() {
     });
 
     socket.on('tickets_update', function(data) {
+        state.tickets = data;
         if (typeof onTicketsUpdate === 'function') {
             onTicketsUpdate(data);
         }
     });
 
+    // The server only sends the new ticket; add it to the local list, or
+    // replace the copy a newer snapshot already holds
+    socket.on('ticket_added', function(data) {
+        const tickets = (state.tickets || []).slice();
+        const index = data.id == null ? -1 : tickets.findIndex(t => t.id === data.id);
+        if (index >= 0) {
+            tickets[index] = data;
+        } else {
+            tickets.push(data);
+        }
+        state.tickets = tickets;
+        if (typeof onTicketsUpdate === 'function') {
+            onTicketsUpdate(state.tickets);
+        }
+    });
+
     socket.on('ticket_update', function(data) {
+        const ticket = (state.tickets || []).find(t => t.id === data.id);
+        if (ticket) {
+            Object.assign(ticket, data.updates);
+        }
         if (typeof onTicketUpdate === 'function') {
             onTicketUpdate(data);
         }
@@ -89,9 +120,11 @@ function initializeSocket() {
         }
     });
 
-    socket.on('runner_log', function(data) {
+    socket.on('runner_log_batch', function(data) {
         if (typeof onRunnerLog === 'function') {
-            onRunnerLog(data);
+            data.logs.forEach(function(log) {
+                onRunnerLog({ runner_id: data.runner_id, log: log });
+            });
         }
     });
 
@@ -126,11 +159,26 @@ function initializeSocket() {
     });
 
     socket.on('dependencies_update', function(data) {
+        state.headmaster = state.headmaster || {};
+        state.headmaster.dependencies = data;
         if (typeof onDependenciesUpdate === 'function') {
             onDependenciesUpdate(data);
         }
     });
 
+    // The server only sends relationships added to the end of the list;
+    // skip any the local list already has (e.g. from a newer snapshot)
+    socket.on('dependencies_append', function(data) {
+        state.headmaster = state.headmaster || {};
+        const dependencies = state.headmaster.dependencies || [];
+        const known = new Set(dependencies.map(d => d.from + '\u0000' + d.to));
+        const added = data.filter(d => !known.has(d.from + '\u0000' + d.to));
+        state.headmaster.dependencies = dependencies.concat(added);
+        if (typeof onDependenciesUpdate === 'function') {
+            onDependenciesUpdate(state.headmaster.dependencies);
+        }
+    });
+
     socket.on('review_update', function(data) {
         if (typeof onReviewUpdate === 'function') {
             onReviewUpdate(data);
@@ -138,6 +186,17 @@ function initializeSocket() {
     });
 }
 
+/**
+ * Describe the current view so the server only sends events it displays
+ */
+function viewSubscription() {
+    if (typeof RUNNER_ID !== 'undefined') {
+        return { view: 'runner', runner_id: RUNNER_ID };
+    }
+    const segment = window.location.pathname.replace(/^\/+|\/+$/g, '').split('/')[0];
+    return { view: segment || 'dashboard' };
+}
+
 /**
  * Update connection status indicator
  */
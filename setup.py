@@ -1,50 +0,0 @@
-"""
-Setup script for Five Minds
-"""
-
-from setuptools import setup, find_packages
-from pathlib import Path
-
-# Read the README file
-readme_file = Path(__file__).parent / "README.md"
-long_description = readme_file.read_text(encoding="utf-8") if readme_file.exists() else ""
-
-setup(
-    name="fiveminds",
-    version="0.1.0",
-    author="Five Minds Team",
-    description="An agentic, repo-native AI dev system",
-    long_description=long_description,
-    long_description_content_type="text/markdown",
-    url="https://github.com/FrenchFive/FiveMinds-",
-    packages=find_packages(),
-    classifiers=[
-        "Development Status :: 3 - Alpha",
-        "Intended Audience :: Developers",
-        "Topic :: Software Development :: Build Tools",
-        "License :: OSI Approved :: MIT License",
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Python :: 3.11",
-    ],
-    python_requires=">=3.8",
-    install_requires=[
-        "pyyaml>=6.0",
-        "gitpython>=3.1.0",
-    ],
-    extras_require={
-        "dev": [
-            "pytest>=7.0",
-            "pytest-cov>=4.0",
-            "black>=22.0",
-            "flake8>=5.0",
-        ],
-    },
-    entry_points={
-        "console_scripts": [
-            "fiveminds=fiveminds.cli:main",
-        ],
-    },
-)
@@ -0,0 +1,91 @@
+import shutil
+import subprocess
+import threading
+
+import pytest
+
+from fiveminds.tools.git import GitTools
+from fiveminds.tools.logring import LogRing
+
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+@pytest.fixture
+def git(tmp_path):
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    return GitTools(str(tmp_path))
+
+
+@requires_git
+def test_mutating_op_logs_include_call_and_outcome(git):
+    """A public method's result logs start at its own "called" line"""
+    result = git.checkout("nope")
+
+    assert not result.success
+    assert result.logs[0] == "git.checkout called: target=nope, create=False"
+    assert result.logs[1] == "Executing: git checkout nope"
+    assert result.logs[-1].startswith("git.checkout failed: ")
+
+
+@requires_git
+def test_failed_read_op_logs_include_call(git):
+    """Failure paths of status/diff keep the "called" line too"""
+    result = git.diff(target="no-such-ref")
+
+    assert not result.success
+    assert result.logs[0].startswith("git.diff called")
+
+
+@requires_git
+def test_bulk_keeps_logs_per_operation(git):
+    """Each bulk() result only carries its own operation's log entries"""
+    ops = [("status", {"short": True}), ("diff", {}), ("status", {})] * 8
+
+    results = git.bulk(ops)
+
+    assert len(results) == len(ops)
+    for (name, _), result in zip(ops, results):
+        assert result.success
+        assert result.logs[0].startswith(f"git.{name} called")
+        assert result.logs[-1] == f"git.{name} completed successfully"
+        assert len(result.logs) == 3
+
+
+def test_log_ring_since_is_per_thread():
+    """Entries logged by other threads are not returned by since()"""
+    ring = LogRing()
+    collected = {}
+    start = threading.Barrier(4)
+
+    def worker(n):
+        start.wait()
+        mark = ring.mark()
+        for i in range(200):
+            ring.append(f"{n}:{i}")
+        collected[n] = ring.since(mark)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for n in range(4):
+        assert collected[n] == tuple(f"{n}:{i}" for i in range(200))
+    assert len(ring.snapshot()) == 800
+
+
+def test_log_ring_drops_oldest_entries():
+    """The ring keeps only its most recent entries"""
+    ring = LogRing(size=3)
+    mark = ring.mark()
+    for i in range(5):
+        ring.append(str(i))
+
+    assert ring.snapshot() == ("2", "3", "4")
+    assert ring.since(mark) == ("2", "3", "4")
+
+    ring.clear()
+    assert ring.snapshot() == ()
+    assert ring.since(mark) == ()
@@ -0,0 +1,262 @@
+import difflib
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from fiveminds.tools.repo import RepoTools, _LINE_ONLY_SYNTAX
+
+
+SAMPLE = (
+    "def foo():\n"
+    "    return foo_bar\n"
+    "\n"
+    "say foo\n"
+    "xfoo\n"
+    "foo\tbar\n"
+    "foo  \n"
+    "  trailing  \n"
+    "FOO upper\n"
+    "last line foo"
+)
+
+# Possessive quantifiers and atomic groups need Python 3.11
+needs_311 = pytest.mark.skipif(sys.version_info < (3, 11), reason="needs Python 3.11 regex syntax")
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+PATTERNS = [
+    r"foo",
+    r"foo(?!\s)",
+    r"(?<!x)foo",
+    r"(?<!x)foo$",
+    r"foo(?=_)",
+    r"^\s*$",
+    r"\s$",
+    r"^foo",
+    r"foo$",
+    r"\bfoo\b",
+    r"[^x]foo",
+    r"foo[^x]",
+    r"bar\s*",
+    r"\Afoo",
+    r"foo\Z",
+    r"o.*",
+    r"(?s)foo.",
+    pytest.param(r"o\s++$", marks=needs_311),
+    pytest.param(r"\s*+$", marks=needs_311),
+    pytest.param(r"(?>\s*)$", marks=needs_311),
+]
+
+
+def per_line_matches(pattern, content, flags=0):
+    """Lines a plain line-by-line scan reports."""
+    regex = re.compile(pattern, flags)
+    return [
+        (num, line.strip())
+        for num, line in enumerate(content.split("\n"), 1)
+        if regex.search(line)
+    ]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_candidate_lines_cover_per_line_matches(pattern):
+    """Every line a per-line scan matches is a candidate of the buffer scan"""
+    if _LINE_ONLY_SYNTAX.search(pattern):
+        pytest.skip("search() scans these patterns line by line")
+    buffer_regex = re.compile(pattern, re.MULTILINE)
+    candidates = dict(RepoTools._candidate_lines(SAMPLE, buffer_regex))
+    lines = SAMPLE.split("\n")
+
+    for num, _ in per_line_matches(pattern, SAMPLE):
+        assert candidates.get(num) == lines[num - 1]
+    for num, line in candidates.items():
+        assert lines[num - 1] == line
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+@pytest.mark.parametrize("case_sensitive", [True, False])
+def test_search_matches_per_line_scan(tmp_path, pattern, case_sensitive):
+    """search() reports exactly the lines a line-by-line scan finds"""
+    files = {"sample.txt": SAMPLE, "other.txt": "nothing here\n"}
+    for name, content in files.items():
+        (tmp_path / name).write_text(content)
+    (tmp_path / "blob.bin").write_bytes(b"foo\0foo\n")
+
+    result = RepoTools(str(tmp_path)).search(pattern, case_sensitive=case_sensitive)
+
+    assert result.success
+    flags = 0 if case_sensitive else re.IGNORECASE
+    expected = sorted(
+        (name,) + match
+        for name, content in files.items()
+        for match in per_line_matches(pattern, content, flags)
+    )
+    found = sorted((m["file"], m["line"], m["content"]) for m in result.output)
+    assert found == expected
+
+
+def test_search_literal_prefilter_skips_files_without_literal(tmp_path):
+    """A plain literal only reports files that contain it"""
+    (tmp_path / "a.txt").write_text("needle here\n")
+    (tmp_path / "b.txt").write_text("haystack only\n")
+
+    result = RepoTools(str(tmp_path)).search("needle")
+
+    assert [(m["file"], m["line"]) for m in result.output] == [("a.txt", 1)]
+    assert result.metadata == {"truncated": False, "truncated_files": []}
+
+
+def test_search_reports_no_truncation_at_exact_budget(tmp_path):
+    """Reaching a budget without dropping a match is not truncation"""
+    (tmp_path / "a.txt").write_text("hit\n" * 3)
+
+    result = RepoTools(str(tmp_path)).search("hit", max_matches=3, max_matches_per_file=3)
+
+    assert len(result.output) == 3
+    assert result.metadata == {"truncated": False, "truncated_files": []}
+
+
+def test_search_reports_truncation(tmp_path):
+    """Dropped matches are flagged in the result metadata"""
+    (tmp_path / "a.txt").write_text("hit\n" * 100)
+    tools = RepoTools(str(tmp_path))
+
+    unbounded = tools.search("hit")
+    assert len(unbounded.output) == 100
+    assert not unbounded.metadata["truncated"]
+
+    per_file = tools.search("hit", max_matches_per_file=10)
+    assert len(per_file.output) == 10
+    assert per_file.metadata["truncated_files"] == ["a.txt"]
+
+    overall = tools.search("hit", max_matches=5)
+    assert len(overall.output) == 5
+    assert overall.metadata["truncated"]
+
+
+def test_validate_path_rechecks_swapped_symlink(tmp_path):
+    """A path that becomes a symlink out of the repo is rejected"""
+    repo = tmp_path / "repo"
+    outside = tmp_path / "outside"
+    (repo / "sub").mkdir(parents=True)
+    outside.mkdir()
+    (repo / "sub" / "a.txt").write_text("inside\n")
+    (outside / "a.txt").write_text("secret\n")
+    tools = RepoTools(str(repo))
+
+    assert tools.read("sub/a.txt").success
+
+    shutil.rmtree(repo / "sub")
+    os.symlink(outside, repo / "sub")
+
+    result = tools.read("sub/a.txt")
+    assert not result.success
+    assert "outside repository bounds" in result.error
+
+
+@pytest.mark.parametrize("path", ["../outside", "/etc", "sub/../../outside"])
+def test_validate_path_rejects_paths_outside_repo(tmp_path, path):
+    """Relative escapes and absolute paths outside the repo are rejected"""
+    (tmp_path / "repo" / "sub").mkdir(parents=True)
+
+    with pytest.raises(ValueError):
+        RepoTools(str(tmp_path / "repo"))._validate_path(path)
+
+
+PATCH = (
+    "--- a/s.txt\n"
+    "+++ b/s.txt\n"
+    "@@ -1,3 +1,4 @@\n"
+    " a\n"
+    "-b\n"
+    "+B\n"
+    "+b2\n"
+    " c\n"
+)
+
+
+def make_repo(root, subdir):
+    """Create a git repo with s.txt under `subdir`; return the RepoTools root."""
+    target = root / subdir if subdir else root
+    target.mkdir(parents=True, exist_ok=True)
+    (target / "s.txt").write_text("a\nb\nc\n")
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    return target
+
+
+@requires_git
+@pytest.mark.parametrize("subdir", ["", "sub"])
+@pytest.mark.parametrize("dry_run", [True, False])
+def test_apply_patch_backends_agree(tmp_path, subdir, dry_run):
+    """git apply and the built-in parser report the same results"""
+    git_root = make_repo(tmp_path / "git", subdir)
+    py_root = make_repo(tmp_path / "py", subdir)
+
+    via_git = RepoTools(str(git_root)).apply_patch(PATCH, dry_run=dry_run)
+    via_python = RepoTools(str(py_root)).apply_patch(PATCH, dry_run=dry_run, force_python=True)
+
+    assert via_git.success and via_python.success
+    assert via_git.output == via_python.output
+    assert via_git.output["files"] == [{
+        "file": "s.txt",
+        "status": "would_apply" if dry_run else "applied",
+        "hunks": 1,
+        "additions": 2,
+        "deletions": 1
+    }]
+    assert (git_root / "s.txt").read_text() == (py_root / "s.txt").read_text()
+
+
+@requires_git
+def test_apply_patch_git_errors_become_results(tmp_path):
+    """An OSError from the git backend is reported, not raised"""
+    tools = RepoTools(str(make_repo(tmp_path, "")))
+    shutil.rmtree(tmp_path)
+
+    result = tools.apply_patch(PATCH)
+
+    assert not result.success
+    assert result.error
+
+
+@requires_git
+@pytest.mark.parametrize("other", ["old.txt", None])
+def test_diff_git_output_matches_difflib(tmp_path, other):
+    """The git backend produces the same text as difflib"""
+    old = "def foo():\n" + "".join(f"    x{i}\n" for i in range(20))
+    new = "def foo():\n" + "".join(f"    x{i}\n" for i in range(20) if i != 10) + "    y\n"
+    (tmp_path / "old.txt").write_text(old)
+    (tmp_path / "new.txt").write_text(new)
+
+    result = RepoTools(str(tmp_path)).diff("new.txt", other)
+
+    assert result.success
+    expected = difflib.unified_diff(
+        old.splitlines(keepends=True) if other else [],
+        new.splitlines(keepends=True),
+        fromfile=other or "/dev/null",
+        tofile="new.txt"
+    )
+    assert result.output["diff"] == "".join(expected)
+
+
+@pytest.mark.parametrize("text", ["", "one", "one\n", "a\nb\nc", "a\nb\nc\n", "\n\n"])
+@pytest.mark.parametrize("start_line,end_line", [
+    (0, None), (1, None), (0, 2), (1, 2), (2, 1), (-2, None), (0, -1), (5, None), (0, 100)
+])
+def test_read_matches_split_lines(tmp_path, text, start_line, end_line):
+    """read() returns the same slice as splitting the text on newlines"""
+    (tmp_path / "f.txt").write_text(text)
+    lines = text.split("\n")
+
+    result = RepoTools(str(tmp_path)).read("f.txt", start_line, end_line)
+
+    assert result.success
+    expected = lines[start_line:end_line]
+    assert result.output["content"] == "\n".join(expected)
+    assert result.output["lines"] == len(expected)
+    assert result.output["total_lines"] == len(lines)
@@ -0,0 +1,136 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+from fiveminds.tools import shell as shell_module
+from fiveminds.tools.shell import ShellTools
+
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="fast spawn path is POSIX only")
+
+
+@pytest.fixture
+def shell(tmp_path):
+    tools = ShellTools(str(tmp_path))
+    yield tools
+    tools.close()
+
+
+@posix_only
+def test_run_captures_output_and_exit_code(shell):
+    """The fast spawn path reports stdout, stderr and the exit code"""
+    result = shell.run(sys.executable, ["-c", "import sys; print('out'); sys.stderr.write('err'); sys.exit(3)"])
+
+    assert not result.success
+    assert result.output["exit_code"] == 3
+    assert result.output["stdout"] == "out\n"
+    assert result.output["stderr"] == "err"
+
+
+@posix_only
+def test_run_times_out(shell):
+    """A command past its timeout is killed and reported"""
+    result = shell.run(sys.executable, ["-c", "import time; time.sleep(10)"], timeout=1)
+
+    assert not result.success
+    assert "timed out" in result.error
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_run_does_not_leak_inheritable_descriptors(shell):
+    """Descriptors the agent marked inheritable stay out of commands"""
+    read_fd, write_fd = os.pipe()
+    os.set_inheritable(write_fd, True)
+    try:
+        result = shell.run(sys.executable, ["-c", "import os; print(' '.join(os.listdir('/proc/self/fd')))"])
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+    assert result.success
+    assert str(write_fd) not in result.output["stdout"].split()
+
+
+BUILTIN_COMMANDS = [
+    ("echo", ["hello", "world"]),
+    ("echo", []),
+    ("pwd", []),
+    ("true", []),
+    ("false", []),
+    ("which", ["sh"]),
+    ("which", ["sh", "no-such-command-here"]),
+    ("which", ["./tool.sh"]),
+]
+
+
+@posix_only
+@pytest.mark.parametrize("command,args", BUILTIN_COMMANDS)
+def test_builtins_match_real_commands(tmp_path, command, args):
+    """In-process builtins answer exactly like the real executables"""
+    if shutil.which(command) is None:
+        pytest.skip(f"{command} not installed")
+    tool = tmp_path / "tool.sh"
+    tool.write_text("#!/bin/sh\n")
+    tool.chmod(0o755)
+
+    builtin = ShellTools(str(tmp_path)).run(command, args)
+    spawned = ShellTools(str(tmp_path), enable_builtins=False).run(command, args)
+
+    for key in ("exit_code", "stdout", "stderr"):
+        assert builtin.output[key] == spawned.output[key]
+    assert builtin.success == spawned.success
+
+
+@posix_only
+def test_run_truncates_large_output(shell):
+    """Output past MAX_OUTPUT_LENGTH is dropped while reading and marked"""
+    size = shell_module.MAX_OUTPUT_LENGTH + 4096
+    result = shell.run(sys.executable, ["-c", f"import sys; sys.stdout.write('x' * {size})"])
+
+    assert result.success
+    stdout = result.output["stdout"]
+    assert stdout == "x" * shell_module.MAX_OUTPUT_LENGTH + shell_module.TRUNCATION_MARKER
+
+
+requires_pytest = pytest.mark.skipif(shutil.which("pytest") is None, reason="pytest not on PATH")
+
+
+def write_suite(root, failing):
+    (root / "pytest.ini").write_text("[pytest]\n")
+    body = "def test_ok():\n    assert True\n"
+    if failing:
+        body += "\ndef test_bad():\n    assert False\n"
+    (root / "test_suite.py").write_text(body)
+
+
+@requires_pytest
+def test_persistent_runner_matches_one_shot_runs(tmp_path, shell):
+    """The pooled pytest worker reports like a fresh run and sees code changes"""
+    write_suite(tmp_path, failing=False)
+    first = shell.run_tests(persistent=True)
+    worker = shell._batch_runners["pytest"]
+
+    write_suite(tmp_path, failing=True)
+    second = shell.run_tests(persistent=True)
+    one_shot = shell.run_tests()
+
+    assert first.success and first.output["passed"] == 1
+    assert not second.success
+    assert shell._batch_runners["pytest"] is worker
+    for key in ("passed", "failed", "total", "exit_code"):
+        assert second.output[key] == one_shot.output[key]
+
+
+@requires_pytest
+def test_persistent_runner_caps_output(tmp_path, shell, monkeypatch):
+    """The pooled worker's output is capped like run()'s"""
+    monkeypatch.setattr(shell_module, "MAX_OUTPUT_LENGTH", 200)
+    write_suite(tmp_path, failing=True)
+
+    result = shell.run_tests(persistent=True)
+
+    assert result.output["exit_code"] == 1
+    assert result.output["stdout"].endswith(shell_module.TRUNCATION_MARKER)
+    assert len(result.output["stdout"]) == 200 + len(shell_module.TRUNCATION_MARKER)
@@ -0,0 +1,242 @@
+import gzip
+import time
+import urllib.request
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_socketio")
+
+from fiveminds.ui import server as server_module
+from fiveminds.ui.server import UIServer
+
+
+@pytest.fixture
+def ui(monkeypatch):
+    # Keep the background flushers idle so tests decide when events go out
+    monkeypatch.setattr(server_module, "EMIT_FLUSH_INTERVAL", 60)
+    monkeypatch.setattr(server_module, "LOG_FLUSH_INTERVAL", 60)
+    server = UIServer()
+    yield server
+    server.stop()
+
+
+def received_events(client):
+    """Events a client got, in order, with batches unpacked."""
+    events = []
+    for packet in client.get_received():
+        if packet["name"] == "batch":
+            events.extend((name, data) for name, data in packet["args"][0])
+        else:
+            events.append((packet["name"], packet["args"][0]))
+    return events
+
+
+def test_connect_snapshot_follows_queued_events(ui):
+    """Events queued before a client connects reach it before its snapshot"""
+    ui.add_runner("R1", "T1")
+    ui.update_runner_log("R1", "line 1")
+    ui.flush_runner_logs()
+    ui.set_dependencies([{"from": "T1", "to": "T2"}])
+    ui.set_dependencies([{"from": "T1", "to": "T2"}, {"from": "T2", "to": "T3"}])
+
+    client = ui.socketio.test_client(ui.app)
+    ui.flush_emits()
+    events = received_events(client)
+
+    assert events[-1][0] == "state_update"
+    assert events[-1][1]["runners"]["R1"]["logs"][0]["message"] == "line 1"
+    assert len(events[-1][1]["headmaster"]["dependencies"]) == 2
+    client.disconnect()
+
+
+def test_queued_payloads_do_not_change_before_sending(ui):
+    """Events carry the state as it was when they were queued"""
+    client = ui.socketio.test_client(ui.app)
+    client.get_received()
+
+    ui.set_tickets([{"id": "T1", "status": "open"}])
+    ui.add_runner("R1", "T1")
+    ui.update_runner_log("R1", "line 1")
+    ui.flush_runner_logs()
+    ui.update_ticket("T1", {"status": "done"})
+    ui.flush_emits()
+    events = dict(received_events(client))
+
+    assert events["tickets_update"] == [{"id": "T1", "status": "open"}]
+    assert events["runner_update"]["logs"] == []
+    assert [log["message"] for log in events["runner_log_batch"]["logs"]] == ["line 1"]
+    client.disconnect()
+
+
+def test_get_state_returns_python_objects(ui):
+    """get_state() hands Python callers a copy holding the stored objects"""
+    ui.update_headmaster("plan", ("a", "b"))
+
+    state = ui.get_state()
+    state["status"] = "changed"
+
+    assert state["headmaster"]["plan"] == ("a", "b")
+    assert ui.get_state()["status"] != "changed"
+    version, changed = ui.get_state_if_changed()
+    assert changed["headmaster"]["plan"] == ("a", "b")
+    assert ui.get_state_if_changed(version) is None
+
+
+def test_state_poll_answers_304_until_state_changes(ui):
+    """/api/state returns 304 for a current ETag and 200 after a change"""
+    http = ui.app.test_client()
+    first = http.get("/api/state")
+    etag = first.headers["ETag"]
+
+    unchanged = http.get("/api/state", headers={"If-None-Match": etag})
+    ui.set_status("running")
+    changed = http.get("/api/state", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert unchanged.status_code == 304 and unchanged.data == b""
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.get_json()["status"] == "running"
+
+
+def test_large_state_is_served_gzipped(ui):
+    """Large bodies are gzipped for clients that accept it, with their own ETag"""
+    ui.set_tickets([{"id": f"T{i}", "title": "ticket " * 20} for i in range(50)])
+    http = ui.app.test_client()
+
+    plain = http.get("/api/state")
+    zipped = http.get("/api/state", headers={"Accept-Encoding": "gzip"})
+    again = http.get("/api/state", headers={"Accept-Encoding": "gzip",
+                                            "If-None-Match": zipped.headers["ETag"]})
+
+    assert "Content-Encoding" not in plain.headers
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert zipped.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(zipped.data) == plain.data
+    assert zipped.headers["ETag"] == plain.headers["ETag"][:-1] + '-gz"'
+    assert again.status_code == 304
+
+
+def test_pages_are_rendered_once_per_path(ui, monkeypatch):
+    """View pages are cached per path, with the oldest path dropped first"""
+    monkeypatch.setattr(server_module, "PAGE_CACHE_SIZE", 2)
+    rendered = []
+    render = server_module.render_template
+
+    def counting_render(template, **context):
+        rendered.append((template, context))
+        return render(template, **context)
+
+    monkeypatch.setattr(server_module, "render_template", counting_render)
+    http = ui.app.test_client()
+
+    first = http.get("/runner/R1")
+    second = http.get("/runner/R1")
+    http.get("/runner/R2")
+    http.get("/")
+
+    assert first.status_code == 200 and second.data == first.data
+    assert rendered[0] == ("runner_detail.html", {"runner_id": "R1"})
+    assert len(rendered) == 3
+    assert list(ui._page_cache) == ["/runner/R2", "/"]
+
+
+def test_queued_events_go_out_as_batches(ui, monkeypatch):
+    """Queued events are sent in order, up to EMIT_BATCH_MAX per batch"""
+    monkeypatch.setattr(server_module, "EMIT_BATCH_MAX", 3)
+    client = ui.socketio.test_client(ui.app)
+    client.get_received()
+
+    ui.add_progress("alone")
+    ui.flush_emits()
+    single = client.get_received()
+    for i in range(5):
+        ui.add_progress(f"step {i}")
+    ui.flush_emits()
+    packets = client.get_received()
+
+    assert [p["name"] for p in single] == ["progress_update"]
+    assert [p["name"] for p in packets] == ["batch", "batch"]
+    assert [len(p["args"][0]) for p in packets] == [3, 2]
+    messages = [data["message"] for p in packets for _, data in p["args"][0]]
+    assert messages == [f"step {i}" for i in range(5)]
+    client.disconnect()
+
+
+def test_only_latest_snapshot_events_are_sent(ui):
+    """Of several queued full-snapshot events only the newest goes out"""
+    client = ui.socketio.test_client(ui.app)
+    client.get_received()
+
+    ui.set_dependencies([])
+    ui.set_dependencies([{"from": "A", "to": "B"}])
+    ui.set_dependencies([{"from": "C", "to": "D"}])
+    ui.set_status("running")
+    ui.set_status("idle")
+    ui.flush_emits()
+    events = received_events(client)
+
+    names = [name for name, _ in events]
+    assert names.count("dependencies_update") == 1
+    assert dict(events)["dependencies_update"] == [{"from": "C", "to": "D"}]
+    # Every status transition is kept
+    assert [data for name, data in events if name == "status_update"] == ["running", "idle"]
+    client.disconnect()
+
+
+def test_scoped_events_reach_only_their_views(ui):
+    """Runner logs and reasoning only reach clients whose view shows them"""
+    clients = {
+        "all": ui.socketio.test_client(ui.app),
+        "headmaster": ui.socketio.test_client(ui.app, auth={"view": "headmaster"}),
+        "runner R1": ui.socketio.test_client(ui.app, auth={"view": "runner", "runner_id": "R1"}),
+        "runner R2": ui.socketio.test_client(ui.app, auth={"view": "runner", "runner_id": "R2"}),
+    }
+    for client in clients.values():
+        client.get_received()
+
+    ui.add_runner("R1", "T1")
+    ui.update_runner_log("R1", "line")
+    ui.flush_runner_logs()
+    ui.add_headmaster_reasoning("thinking")
+    ui.flush_emits()
+    names = {key: {name for name, _ in received_events(client)} for key, client in clients.items()}
+
+    assert {"runner_log_batch", "headmaster_reasoning", "runner_update"} <= names["all"]
+    assert "runner_log_batch" in names["runner R1"]
+    assert "runner_log_batch" not in names["runner R2"]
+    assert "runner_log_batch" not in names["headmaster"]
+    assert "headmaster_reasoning" in names["headmaster"]
+    assert "headmaster_reasoning" not in names["runner R1"]
+    # Unscoped events still reach every client
+    assert all("runner_update" in found for found in names.values())
+    for client in clients.values():
+        client.disconnect()
+
+
+def test_stop_flushes_and_shuts_down_server(monkeypatch):
+    """stop() delivers pending updates and ends the background HTTP server"""
+    monkeypatch.setattr(server_module, "EMIT_FLUSH_INTERVAL", 60)
+    monkeypatch.setattr(server_module, "LOG_FLUSH_INTERVAL", 60)
+    ui = UIServer(port=0)
+    client = ui.socketio.test_client(ui.app)
+    client.get_received()
+    ui.start()
+    deadline = time.monotonic() + 5
+    while ui._wsgi_server is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    port = ui._wsgi_server.server_port
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/state", timeout=5) as response:
+        assert response.status == 200
+
+    ui.add_runner("R1", "T1")
+    ui.update_runner_log("R1", "last line")
+    thread = ui._server_thread
+    ui.stop()
+
+    assert not thread.is_alive()
+    assert "runner_log_batch" in {name for name, _ in received_events(client)}
+    with pytest.raises(OSError):
+        urllib.request.urlopen(f"http://127.0.0.1:{port}/api/state", timeout=1)
+    client.disconnect()